@@ -0,0 +1,180 @@
+"""
+Latency and throughput benchmark of the product, cart and checkout endpoints.
+
+For each dataset size a catalogue, a user and baskets are built with the
+test factories, then every scenario sends requests through the real URLconf
+and middleware in-process with the DRF test client. `compare` flags the
+results whose p95 latency or throughput regressed against a baseline.
+"""
+import json
+import os
+import random
+import statistics
+from time import perf_counter
+
+import factory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app.cart.models import Basket, Line
+from app.cart.test.factories import LineFactory
+from app.catalogue.models import Product
+from app.catalogue.test.factories import ProductClassFactory, ProductFactory
+from app.users.test.factories import UserFactory
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'benchmark_baseline.json')
+
+
+class Dataset:
+    """
+    A catalogue of `size` products and a user with an open basket holding
+    up to `lines` of them.
+    """
+
+    def __init__(self, size, lines):
+        self.size = size
+        self.lines = min(size, lines)
+        self.users = []
+        product_class = ProductClassFactory()
+        self.products = Product.objects.bulk_create(
+            ProductFactory.build_batch(size, product_class=product_class, title=factory.Faker('catch_phrase')))
+        self.user, self.client = self.add_user()
+        self.fill_baskets([self.user])
+
+    def add_user(self):
+        user = UserFactory()
+        self.users.append(user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {user.auth_token}')
+        return user, client
+
+    def fill_baskets(self, users):
+        """
+        Gives each user an open basket and returns the baskets in the order
+        of the users.
+        """
+        baskets = Basket.objects.bulk_create(Basket(user=user) for user in users)
+        Line.objects.bulk_create(
+            LineFactory.build(basket=basket, product=product, price=product.price, quantity=2)
+            for basket in baskets for product in random.sample(self.products, self.lines))
+        baskets = Basket.objects.filter(pk__in=[basket.pk for basket in baskets])
+        baskets.recalculate_totals()
+        by_user = {str(basket.user_id): basket for basket in baskets}
+        return [by_user[str(user.pk)] for user in users]
+
+    def delete(self):
+        for user in self.users:
+            user.delete()
+        Product.objects.filter(pk__in=[product.pk for product in self.products]).delete()
+
+
+def list_products(dataset, count):
+    return lambda: dataset.client.get(reverse('product-list'))
+
+
+def search_products(dataset, count):
+    words = [product.title.split()[0] for product in random.sample(dataset.products, min(dataset.size, 20))]
+    return lambda: dataset.client.get(reverse('product-search'), {'q': random.choice(words)})
+
+
+def get_basket(dataset, count):
+    return lambda: dataset.client.get(reverse('basket'))
+
+
+def add_to_basket(dataset, count):
+    return lambda: dataset.client.post(
+        reverse('basket'), {'product': random.choice(dataset.products).pk, 'quantity': 1})
+
+
+def checkout(dataset, count):
+    # A shopper per checkout, users have a single open basket.
+    shoppers = [dataset.add_user() for _ in range(count)]
+    checkouts = iter(zip(dataset.fill_baskets([user for user, __ in shoppers]), shoppers))
+
+    def request():
+        basket, (__, client) = next(checkouts)
+        return client.post(
+            reverse('order-list-create'), {'basket': basket.pk, 'total': basket.total}, format='json')
+    return request
+
+
+# Each scenario takes the dataset and the number of requests it will send,
+# and returns a function sending one request.
+SCENARIOS = {
+    'product-list': list_products,
+    'product-search': search_products,
+    'basket-get': get_basket,
+    'basket-add': add_to_basket,
+    'checkout': checkout,
+}
+
+
+def measure(request, requests, warmup=0):
+    """
+    Sends `warmup` requests, then times `requests` more and returns their
+    p50/p95/p99 latency in milliseconds and the requests per second.
+    """
+    for _ in range(warmup):
+        request()
+    latencies = []
+    start = perf_counter()
+    for _ in range(requests):
+        sent = perf_counter()
+        response = request()
+        latencies.append(perf_counter() - sent)
+        if not status.is_success(response.status_code):
+            raise AssertionError(f"{response.status_code} {response.content[:500]!r}")
+    elapsed = perf_counter() - start
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'p50': round(cuts[49] * 1000, 3),
+        'p95': round(cuts[94] * 1000, 3),
+        'p99': round(cuts[98] * 1000, 3),
+        'rps': round(requests / elapsed, 1),
+    }
+
+
+def run_benchmarks(sizes, requests=100, warmup=10, lines=20, scenarios=None, rounds=3):
+    """
+    Returns `{scenario: {size: stats}}`, the sizes as strings so the results
+    round-trip through JSON. Each scenario runs `rounds` times and keeps its
+    best figures, which are much less noisy than those of a single round.
+    """
+    results = {name: {} for name in scenarios or SCENARIOS}
+    for size in sizes:
+        dataset = Dataset(size, lines)
+        try:
+            for name in results:
+                runs = [measure(SCENARIOS[name](dataset, warmup + requests), requests, warmup)
+                        for _ in range(rounds)]
+                results[name][str(size)] = {
+                    stat: max(run[stat] for run in runs) if stat == 'rps' else min(run[stat] for run in runs)
+                    for stat in runs[0]
+                }
+        finally:
+            dataset.delete()
+    return results
+
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Returns a message for each scenario and size whose p95 latency grew, or
+    whose throughput dropped, by more than `tolerance` of the baseline.
+    """
+    regressions = []
+    for name, by_size in results.items():
+        for size, stats in by_size.items():
+            base = baseline.get(name, {}).get(size)
+            if base is None:
+                continue
+            if stats['p95'] > base['p95'] * (1 + tolerance):
+                regressions.append(f"{name} at {size}: p95 {stats['p95']}ms, baseline {base['p95']}ms")
+            if stats['rps'] < base['rps'] * (1 - tolerance):
+                regressions.append(f"{name} at {size}: {stats['rps']} requests/s, baseline {base['rps']}")
+    return regressions
+
+
+def load_baseline(path=BASELINE_PATH):
+    with open(path) as baseline:
+        return json.load(baseline)
@@ -0,0 +1,75 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from app.base.benchmark import (BASELINE_PATH, SCENARIOS, compare,
+                                load_baseline, run_benchmarks)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the p50/p95/p99 latency and the requests/s of the product, cart and checkout endpoints at "
+        "several dataset sizes and compare them with a baseline. The datasets are built with the test factories "
+        "in a throwaway test database, so the development requirements must be installed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[10, 100, 1000], help="Numbers of products in the catalogue.")
+        parser.add_argument('--requests', type=int, default=100, help="Number of timed requests per scenario.")
+        parser.add_argument('--warmup', type=int, default=10, help="Number of untimed requests per scenario.")
+        parser.add_argument(
+            '--rounds', type=int, default=3, help="Number of runs of each scenario, the best one is kept.")
+        parser.add_argument('--lines', type=int, default=20, help="Number of lines per basket.")
+        parser.add_argument(
+            '--scenario', action='append', choices=sorted(SCENARIOS), dest='scenarios',
+            help="Scenario to run, can be repeated. All of them by default.")
+        parser.add_argument('--output', help="Write the results as JSON to this file.")
+        parser.add_argument('--baseline', default=BASELINE_PATH, help="JSON results to compare with.")
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help="Fraction by which p95 latency may grow or requests/s drop before it is a regression.")
+        parser.add_argument(
+            '--save-baseline', action='store_true', help="Write the results to the baseline instead of comparing.")
+        parser.add_argument('--keepdb', action='store_true', help="Keep the test database between runs.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False,
+                                                      keepdb=options['keepdb'])
+        try:
+            results = run_benchmarks(
+                options['sizes'], options['requests'], options['warmup'], options['lines'], options['scenarios'],
+                options['rounds'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        for name, by_size in results.items():
+            for size, stats in by_size.items():
+                self.stdout.write(
+                    f"{name:<16} {size:>6} products: p50 {stats['p50']:.1f}ms, p95 {stats['p95']:.1f}ms, "
+                    f"p99 {stats['p99']:.1f}ms, {stats['rps']:.1f} requests/s")
+
+        if options['output']:
+            self.write(options['output'], results)
+        if options['save_baseline']:
+            self.write(options['baseline'], results)
+            return
+        if not os.path.exists(options['baseline']):
+            self.stdout.write(f"No baseline at {options['baseline']}, run with --save-baseline to record one.")
+            return
+
+        regressions = compare(results, load_baseline(options['baseline']), options['tolerance'])
+        if regressions:
+            raise CommandError("Regressions against the baseline:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+
+    def write(self, path, results):
+        with open(path, 'w') as output:
+            json.dump(results, output, indent=4)
+            output.write('\n')
+        self.stdout.write(self.style.SUCCESS(f"Wrote the results to {path}."))
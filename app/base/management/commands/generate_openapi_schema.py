@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.urls import schema_view
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema served by /swagger/ and /redoc/, run it whenever the API changes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="File to write the schema to, defaults to OPENAPI_SCHEMA_PATH.")
+
+    def handle(self, *args, **options):
+        path = options['output'] or settings.OPENAPI_SCHEMA_PATH
+        with open(path, 'wb') as output:
+            output.write(schema_view.generate())
+        self.stdout.write(self.style.SUCCESS(f"Wrote the OpenAPI schema to {path}."))
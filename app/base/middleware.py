@@ -0,0 +1,52 @@
+"""
+Middleware that stays out of the way of token authenticated API requests.
+
+Sessions, CSRF protection, `request.user` and messages only serve browser
+clients: the API authenticates tokens itself, in the views. These
+subclasses of the Django middleware skip their work when a request to the
+API carries a `Token` Authorization header, so that requests of API clients
+never read the session table. The browsable API, which relies on the
+session, and the admin keep the full stack.
+"""
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import csrf
+
+
+def is_token_api_request(request):
+    """
+    Whether the request is an API call authenticated with a token.
+    """
+    if not request.path_info.startswith(settings.API_PATH_PREFIX):
+        return False
+    return request.META.get('HTTP_AUTHORIZATION', '').startswith('Token ')
+
+
+class SkipTokenAPIRequestsMixin:
+
+    def __call__(self, request):
+        if is_token_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(SkipTokenAPIRequestsMixin, sessions.SessionMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(SkipTokenAPIRequestsMixin, csrf.CsrfViewMiddleware):
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if is_token_api_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(SkipTokenAPIRequestsMixin, auth.AuthenticationMiddleware):
+    pass
+
+
+class MessageMiddleware(SkipTokenAPIRequestsMixin, messages.MessageMiddleware):
+    pass
@@ -0,0 +1,68 @@
+"""
+OpenAPI schema views serving a schema generated at build time.
+
+Introspecting every view and serializer takes long, so
+`manage.py generate_openapi_schema` writes the schema to
+`OPENAPI_SCHEMA_PATH` and the views serve that file. Set
+`OPENAPI_SCHEMA_RUNTIME` to generate it on every request instead, e.g.
+while developing the API.
+"""
+import logging
+from functools import lru_cache
+
+from django.conf import settings
+from django.http import HttpResponse
+from drf_yasg import openapi, views
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.renderers import OpenAPIRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def read_schema(path):
+    with open(path, 'rb') as schema:
+        return schema.read()
+
+
+def get_schema_view(info, **kwargs):
+    """
+    `drf_yasg.views.get_schema_view` serving the precomputed schema.
+    """
+    base = views.get_schema_view(info, **kwargs)
+
+    class SchemaView(base):
+
+        @classmethod
+        def generate(cls):
+            """
+            Generate the public schema, encoded as JSON.
+            """
+            # The views are introspected with a request, as when the schema
+            # is generated at runtime.
+            request = Request(APIRequestFactory().get('/swagger/', {'format': 'openapi'}))
+            schema = cls.generator_class(info).get_schema(request=request, public=True)
+            # Let the clients use the host they fetched the schema from.
+            schema.pop('host', None)
+            schema.pop('schemes', None)
+            return OpenAPICodecJson(validators=[]).encode(schema)
+
+        def get(self, request, version='', format=None):
+            if settings.OPENAPI_SCHEMA_RUNTIME:
+                return super().get(request, version, format)
+            # The web UIs only need the title of the schema, then fetch it
+            # with `?format=openapi`.
+            if not isinstance(request.accepted_renderer, OpenAPIRenderer):
+                return Response(openapi.Swagger(info=info, _prefix='/', paths=openapi.Paths(paths={})))
+            try:
+                schema = read_schema(settings.OPENAPI_SCHEMA_PATH)
+            except FileNotFoundError:
+                logger.warning(
+                    "%s is missing, run `manage.py generate_openapi_schema`.", settings.OPENAPI_SCHEMA_PATH)
+                return super().get(request, version, format)
+            return HttpResponse(schema, content_type=f'{OpenAPIRenderer.media_type}; charset=utf-8')
+
+    return SchemaView
@@ -0,0 +1,68 @@
+from collections import defaultdict
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+
+from app.monitoring.timing import timed
+
+
+class ValuesSerializer:
+    """
+    Read only counterpart of a `ModelSerializer` that renders `values()`
+    rows, or model instances, to plain dicts of the same shape.
+
+    The fields of `serializer_class` are inspected once: every row is then
+    rendered by calling the `to_representation` of the same field objects on
+    its column, without building model instances or serializers per row.
+    Nested serializers are left to subclasses, which pass their data to
+    `to_representation` by field name.
+    """
+    serializer_class = None
+    serializer_kwargs = {}
+
+    def __init__(self):
+        serializer = self.serializer_class(**self.serializer_kwargs)
+        model = serializer.Meta.model
+        self.fields = []
+        for name, field in serializer.fields.items():
+            if isinstance(field, serializers.BaseSerializer):
+                self.fields.append((name, None, None))
+                continue
+            if '.' in field.source or field.source == '*':
+                raise ImproperlyConfigured(f"{type(self).__name__} cannot render the {name} field.")
+            column = model._meta.get_field(field.source).attname
+            # Related fields render the primary key, which is the column value.
+            to_representation = None if isinstance(field, serializers.RelatedField) else field.to_representation
+            self.fields.append((name, column, to_representation))
+        self.columns = tuple(column for __, column, __ in self.fields if column is not None)
+
+    def to_representation(self, row, **nested):
+        data = {}
+        for name, column, to_representation in self.fields:
+            if column is None:
+                data[name] = nested[name]
+                continue
+            value = row[column]
+            data[name] = value if value is None or to_representation is None else to_representation(value)
+        return data
+
+    @timed('serialize')
+    def instance_to_representation(self, instance, **nested):
+        return self.to_representation({column: getattr(instance, column) for column in self.columns}, **nested)
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    @timed('serialize')
+    def many_to_representation(self, queryset):
+        return [self.to_representation(row) for row in self.values(queryset)]
+
+    @timed('serialize')
+    def group_by(self, queryset, column):
+        """
+        Render the rows of `queryset` grouped by the value of `column`.
+        """
+        groups = defaultdict(list)
+        for row in queryset.values(*dict.fromkeys((column,) + self.columns)):
+            groups[row[column]].append(self.to_representation(row))
+        return groups
@@ -0,0 +1,73 @@
+"""
+Query budgets of the API endpoints.
+
+`query_budgets.json` holds the number of queries each endpoint may run.
+`query_budget(name)` fails when the block or test it wraps runs more, and
+`QueryBudgetMixin.assertQueryBudget` also fails when the number of queries
+grows with the amount of data, the sign of an N+1 query.
+"""
+import json
+import os
+from contextlib import ContextDecorator
+from functools import lru_cache
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+BUDGETS_PATH = os.path.join(os.path.dirname(__file__), 'query_budgets.json')
+
+
+@lru_cache(maxsize=None)
+def load_budgets():
+    with open(BUDGETS_PATH) as budgets:
+        return json.load(budgets)
+
+
+class query_budget(ContextDecorator):  # pylint: disable=invalid-name
+    """
+    Fails if the wrapped block runs more queries than the budget of `name`.
+    """
+
+    def __init__(self, name, using=DEFAULT_DB_ALIAS):
+        self.name = name
+        self.budget = load_budgets()[name]
+        self.using = using
+        self.queries = None
+
+    def __enter__(self):
+        self.queries = CaptureQueriesContext(connections[self.using])
+        self.queries.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.queries.__exit__(exc_type, exc_value, tb)
+        if exc_type is None and len(self.queries) > self.budget:
+            queries = '\n'.join(f'{n}. {query["sql"]}' for n, query in enumerate(self.queries.captured_queries, 1))
+            raise AssertionError(
+                f"{self.name} ran {len(self.queries)} queries, over its budget of {self.budget}:\n{queries}")
+        return False
+
+    def __len__(self):
+        return len(self.queries)
+
+
+class QueryBudgetMixin:
+    """
+    Checks endpoints against their query budget at growing data sizes.
+    """
+    sizes = (1, 10, 50)
+
+    def assertQueryBudget(self, name, grow, request):  # pylint: disable=invalid-name
+        """
+        For each of `sizes`, `grow(size)` makes the data that size and
+        `request(<what grow returned>)` runs within the budget of `name`.
+        The number of queries must be the same at every size.
+        """
+        counts = {}
+        for size in self.sizes:
+            data = grow(size)
+            with query_budget(name) as budget:
+                request(data)
+            counts[size] = len(budget)
+        self.assertEqual(
+            len(set(counts.values())), 1, f"The queries of {name} grow with the data, by size: {counts}")
@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from nose.tools import eq_, ok_
+
+from ...catalogue.models import Product
+from ...order.models import Order
+from ..benchmark import SCENARIOS, compare, run_benchmarks
+
+
+class BenchmarkTestCase(TestCase):
+    """
+    Tests the endpoint benchmark.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_run_benchmarks(self):
+        results = run_benchmarks([1, 5], requests=3, warmup=1, lines=2, rounds=2)
+        eq_(set(results), set(SCENARIOS))
+        for by_size in results.values():
+            eq_(set(by_size), {'1', '5'})
+            for stats in by_size.values():
+                eq_(set(stats), {'p50', 'p95', 'p99', 'rps'})
+                ok_(0 < stats['p50'] <= stats['p95'] <= stats['p99'])
+        # The datasets are deleted, orders included.
+        eq_(Product.objects.count(), 0)
+        eq_(get_user_model().objects.count(), 0)
+        eq_(Order.objects.count(), 0)
+
+    def test_compare(self):
+        baseline = {
+            'basket-get': {'10': {'p50': 4, 'p95': 5, 'p99': 6, 'rps': 200}},
+            'checkout': {'10': {'p50': 8, 'p95': 10, 'p99': 12, 'rps': 100}},
+        }
+        results = {
+            'basket-get': {
+                '10': {'p50': 4, 'p95': 5.9, 'p99': 9, 'rps': 170},
+                '100': {'p50': 40, 'p95': 50, 'p99': 60, 'rps': 20},
+            },
+            'checkout': {'10': {'p50': 9, 'p95': 12.5, 'p99': 14, 'rps': 79}},
+        }
+        eq_(compare(results, baseline), [
+            "checkout at 10: p95 12.5ms, baseline 10ms",
+            "checkout at 10: 79 requests/s, baseline 100",
+        ])
+        eq_(compare(results, baseline, tolerance=0.5), [])
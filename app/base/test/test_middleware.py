@@ -0,0 +1,38 @@
+from django.urls import reverse
+from nose.tools import eq_, ok_
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ...users.test.factories import UserFactory
+
+
+class TokenAPIMiddlewareTestCase(APITestCase):
+    """
+    Tests that token authenticated API requests skip the session machinery.
+    """
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.url = reverse('basket')
+        self.client.force_login(self.user)
+
+    def test_token_request_skips_session(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+        response = self.client.get(self.url)
+        eq_(response.status_code, status.HTTP_200_OK)
+        ok_(not hasattr(response.wsgi_request, 'session'))
+        eq_(str(response.wsgi_request.user.pk), str(self.user.pk))
+
+    def test_session_request_keeps_session(self):
+        response = self.client.get(self.url)
+        eq_(response.status_code, status.HTTP_200_OK)
+        ok_(hasattr(response.wsgi_request, 'session'))
+
+    def test_invalid_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+        eq_(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_admin_keeps_session(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+        response = self.client.get(reverse('admin:index'))
+        ok_(hasattr(response.wsgi_request, 'session'))
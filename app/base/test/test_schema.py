@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from drf_yasg.generators import OpenAPISchemaGenerator
+from nose.tools import eq_, ok_
+
+from ..schema import read_schema
+
+
+class SchemaViewTestCase(TestCase):
+    """
+    Tests the OpenAPI schema views.
+    """
+
+    def setUp(self):
+        read_schema.cache_clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'openapi.json')
+        self.url = reverse('schema-swagger-ui')
+
+    def tearDown(self):
+        self.directory.cleanup()
+        read_schema.cache_clear()
+
+    def get_schema(self):
+        response = self.client.get(self.url, {'format': 'openapi'})
+        eq_(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_serves_generated_schema(self):
+        call_command('generate_openapi_schema', '--output', self.path, stdout=StringIO())
+        with override_settings(OPENAPI_SCHEMA_RUNTIME=True):
+            runtime = self.get_schema()
+        with override_settings(OPENAPI_SCHEMA_RUNTIME=False, OPENAPI_SCHEMA_PATH=self.path):
+            generated = self.get_schema()
+        ok_('/api/v1/cart/' in generated['paths'])
+        runtime.pop('host', None)
+        runtime.pop('schemes', None)
+        eq_(generated, runtime)
+
+    @override_settings(OPENAPI_SCHEMA_RUNTIME=False)
+    def test_serves_file(self):
+        with open(self.path, 'w') as schema:
+            schema.write('{"swagger": "2.0", "paths": {}}')
+        with override_settings(OPENAPI_SCHEMA_PATH=self.path):
+            eq_(self.get_schema(), {"swagger": "2.0", "paths": {}})
+            eq_(self.client.get(self.url).status_code, 200)
+
+    @override_settings(OPENAPI_SCHEMA_RUNTIME=False)
+    def test_missing_file_falls_back_to_runtime(self):
+        with override_settings(OPENAPI_SCHEMA_PATH=self.path):
+            ok_('/api/v1/cart/' in self.get_schema()['paths'])
+
+    @override_settings(OPENAPI_SCHEMA_RUNTIME=False)
+    def test_web_uis_do_not_generate_schema(self):
+        with mock.patch.object(OpenAPISchemaGenerator, 'get_schema') as get_schema:
+            for url in (self.url, reverse('schema-redoc')):
+                response = self.client.get(url)
+                eq_(response.status_code, 200)
+                ok_(b'<title>' in response.content)
+        eq_(get_schema.call_count, 0)
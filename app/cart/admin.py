@@ -5,7 +5,10 @@ from app.cart.models import Basket, Line
 
 @admin.register(Line)
 class LineAdmin(admin.ModelAdmin):
-    pass
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        Basket.objects.filter(pk=obj.basket_id).recalculate_totals()
 
 
 class LineInline(admin.TabularInline):
@@ -17,5 +20,10 @@ class LineInline(admin.TabularInline):
 class BasketAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'status', 'num_lines',
                     'created', 'currency', 'total')
-    readonly_fields = ('user', 'date_submitted')
+    readonly_fields = ('user', 'date_submitted', 'total', 'num_lines', 'num_items', 'currency')
     inlines = [LineInline]
+
+    def save_related(self, request, form, formsets, change):
+        # Lines edited inline bypass `Basket.add_product`.
+        super().save_related(request, form, formsets, change)
+        Basket.objects.filter(pk=form.instance.pk).recalculate_totals()
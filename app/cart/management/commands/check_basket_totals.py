@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from app.cart.models import Basket
+
+
+class Command(BaseCommand):
+    help = "Check the stored basket totals against the basket lines and optionally repair them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix', action='store_true',
+            help="Recompute the stored totals of the baskets that drifted.")
+        parser.add_argument(
+            '--status', action='append', choices=[status for status, __ in Basket.STATUS_CHOICES],
+            help="Only check baskets with this status. Can be repeated.")
+
+    def handle(self, *args, **options):
+        baskets = Basket.objects.annotate(
+            **{f'actual_{name}': expression for name, expression in Basket.line_aggregates().items()})
+        if options['status']:
+            baskets = baskets.filter(status__in=options['status'])
+
+        # The currency is NULL while a basket is empty, and a negated lookup
+        # on a nullable column is true for NULL, so compare it on its own.
+        drifted = Q(currency__isnull=True, actual_currency__isnull=False)
+        drifted |= Q(currency__isnull=False, actual_currency__isnull=True)
+        drifted |= Q(currency__isnull=False, actual_currency__isnull=False) & ~Q(currency=F('actual_currency'))
+        for name in Basket.totals_fields:
+            if name != 'currency':
+                drifted |= ~Q(**{name: F(f'actual_{name}')})
+        ids = []
+        for basket in baskets.filter(drifted).order_by('pk').iterator():
+            ids.append(basket.pk)
+            self.stdout.write(
+                f"Basket #{basket.pk}: "
+                f"total {basket.total} != {basket.actual_total}, "
+                f"lines {basket.num_lines} != {basket.actual_num_lines}, "
+                f"items {basket.num_items} != {basket.actual_num_items}, "
+                f"currency {basket.currency} != {basket.actual_currency}")
+
+        if not ids:
+            self.stdout.write(self.style.SUCCESS("All basket totals are up to date."))
+        elif options['fix']:
+            Basket.objects.filter(pk__in=ids).recalculate_totals()
+            self.stdout.write(self.style.SUCCESS(f"Repaired {len(ids)} basket(s)."))
+        else:
+            self.stdout.write(self.style.WARNING(f"{len(ids)} basket(s) drifted, run with --fix to repair them."))
@@ -0,0 +1,53 @@
+# Generated by Django 3.0.8 on 2026-10-18 12:28
+
+from decimal import Decimal
+from django.db import migrations, models
+
+BACKFILL_TOTALS = """
+UPDATE cart_basket
+SET num_lines = lines.num_lines,
+    num_items = lines.num_items,
+    total = lines.total,
+    currency = lines.currency
+FROM (
+    SELECT basket_id,
+           count(*) AS num_lines,
+           sum(quantity) AS num_items,
+           coalesce(sum(price * quantity), 0) AS total,
+           (array_agg(currency ORDER BY created, id))[1] AS currency
+    FROM cart_line
+    GROUP BY basket_id
+) AS lines
+WHERE cart_basket.id = lines.basket_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0005_auto_20200803_2147'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='basket',
+            name='currency',
+            field=models.CharField(blank=True, max_length=12, null=True, verbose_name='Currency'),
+        ),
+        migrations.AddField(
+            model_name='basket',
+            name='num_items',
+            field=models.PositiveIntegerField(default=0, verbose_name='Number of items'),
+        ),
+        migrations.AddField(
+            model_name='basket',
+            name='num_lines',
+            field=models.PositiveIntegerField(default=0, verbose_name='Number of lines'),
+        ),
+        migrations.AddField(
+            model_name='basket',
+            name='total',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12, verbose_name='Total'),
+        ),
+        migrations.RunSQL(BACKFILL_TOTALS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.0.8 on 2026-10-18 12:29
+
+from django.db import migrations, models
+
+# Merge duplicate lines of a product into the oldest one before the unique
+# constraint is added, then repair the totals of the baskets that changed.
+MERGE_DUPLICATE_LINES = """
+UPDATE cart_line
+SET quantity = duplicates.quantity
+FROM (
+    SELECT min(id) AS id, sum(quantity) AS quantity
+    FROM cart_line
+    GROUP BY basket_id, product_id
+    HAVING count(*) > 1
+) AS duplicates
+WHERE cart_line.id = duplicates.id;
+
+DELETE FROM cart_line
+USING cart_line AS kept
+WHERE cart_line.basket_id = kept.basket_id
+  AND cart_line.product_id = kept.product_id
+  AND cart_line.id > kept.id;
+
+UPDATE cart_basket
+SET num_lines = lines.num_lines,
+    num_items = lines.num_items,
+    total = lines.total
+FROM (
+    SELECT basket_id,
+           count(*) AS num_lines,
+           sum(quantity) AS num_items,
+           coalesce(sum(price * quantity), 0) AS total
+    FROM cart_line
+    GROUP BY basket_id
+) AS lines
+WHERE cart_basket.id = lines.basket_id
+  AND (cart_basket.num_lines <> lines.num_lines OR cart_basket.total <> lines.total)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0006_basket_totals'),
+    ]
+
+    operations = [
+        migrations.RunSQL(MERGE_DUPLICATE_LINES, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='line',
+            constraint=models.UniqueConstraint(fields=('basket', 'product'), name='cart_line_unique_product'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.0.8 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+# Keep the newest open basket of each user, older ones are saved for later.
+SAVE_EXTRA_OPEN_BASKETS = """
+UPDATE cart_basket
+SET status = 'Saved'
+WHERE status = 'Open'
+  AND id NOT IN (SELECT max(id) FROM cart_basket WHERE status = 'Open' GROUP BY user_id)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0007_line_unique_product'),
+    ]
+
+    operations = [
+        migrations.RunSQL(SAVE_EXTRA_OPEN_BASKETS, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='basket',
+            constraint=models.UniqueConstraint(condition=models.Q(status='Open'), fields=('user',), name='cart_basket_unique_open'),
+        ),
+    ]
@@ -1,8 +1,13 @@
 from decimal import Decimal
 
 from django.conf import settings
-from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
-from django.db import models
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.db import connection, models
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from model_utils.models import TimeStampedModel
@@ -10,6 +15,102 @@ from rest_framework.exceptions import ValidationError
 
 from app.catalogue.models import Product
 
+PRICE_FIELD = models.DecimalField(decimal_places=2, max_digits=12)
+
+# Adds items to a basket in one round trip: locks the basket if it can still
+# be edited, upserts the line and applies the change to the basket totals.
+ADD_LINE_SQL = """
+WITH basket AS (
+    SELECT id FROM cart_basket
+    WHERE id = %(basket)s AND status IN %(statuses)s
+    FOR UPDATE
+), line AS (
+    INSERT INTO cart_line (created, modified, basket_id, product_id, quantity, price, currency)
+    SELECT now(), now(), basket.id, %(product)s, %(quantity)s, %(price)s, %(currency)s FROM basket
+    ON CONFLICT (basket_id, product_id) DO UPDATE
+    SET quantity = cart_line.quantity + EXCLUDED.quantity, modified = EXCLUDED.modified
+    RETURNING xmax = 0 AS created, coalesce(price, 0) AS price, currency
+)
+UPDATE cart_basket
+SET num_lines = num_lines + CASE WHEN line.created THEN 1 ELSE 0 END,
+    num_items = num_items + %(quantity)s,
+    total = total + line.price * %(quantity)s,
+    currency = coalesce(cart_basket.currency, line.currency)
+FROM line
+WHERE cart_basket.id = %(basket)s
+RETURNING total, num_lines, num_items, cart_basket.currency
+"""
+
+# Removes items from a basket line in one round trip, deleting the line
+# once its quantity drops to zero. The basket then takes the currency of its
+# first remaining line.
+REMOVE_LINE_SQL = """
+WITH basket AS (
+    SELECT id FROM cart_basket
+    WHERE id = %(basket)s AND status IN %(statuses)s
+    FOR UPDATE
+), line AS (
+    SELECT cart_line.id, quantity, coalesce(price, 0) AS price, quantity + %(quantity)s <= 0 AS emptied
+    FROM cart_line JOIN basket ON basket.id = cart_line.basket_id
+    WHERE product_id = %(product)s
+    FOR UPDATE OF cart_line
+), deleted AS (
+    DELETE FROM cart_line USING line
+    WHERE cart_line.id = line.id AND line.emptied
+), updated AS (
+    UPDATE cart_line SET quantity = cart_line.quantity + %(quantity)s, modified = now()
+    FROM line
+    WHERE cart_line.id = line.id AND NOT line.emptied
+)
+UPDATE cart_basket
+SET num_lines = num_lines - CASE WHEN line.emptied THEN 1 ELSE 0 END,
+    num_items = num_items - least(line.quantity, -%(quantity)s),
+    total = total - line.price * least(line.quantity, -%(quantity)s),
+    currency = CASE WHEN line.emptied THEN (
+        SELECT currency FROM cart_line
+        WHERE basket_id = %(basket)s AND id <> line.id
+        ORDER BY created, id
+        LIMIT 1
+    ) ELSE cart_basket.currency END
+FROM line
+WHERE cart_basket.id = %(basket)s
+RETURNING total, num_lines, num_items, cart_basket.currency
+"""
+
+
+def open_basket_cache_key(user_id):
+    """
+    Cache key of the id of the open basket of a user.
+    """
+    return f'cart:open-basket:{user_id}'
+
+
+class BasketQuerySet(models.QuerySet):
+
+    def update_totals(self, num_lines=0, num_items=0, total=Decimal('0.00'), currency=None):
+        """
+        Apply a change of the basket lines to the stored totals. Call it in
+        the same transaction as the change of the lines.
+        """
+        # The basket takes the currency of its first line: once a line is
+        # removed, that of the first remaining line.
+        if num_lines < 0:
+            currency = Basket.line_aggregates()['currency']
+        else:
+            currency = Coalesce('currency', Value(currency))
+        return self.update(
+            num_lines=F('num_lines') + num_lines,
+            num_items=F('num_items') + num_items,
+            total=F('total') + total,
+            currency=currency,
+        )
+
+    def recalculate_totals(self):
+        """
+        Recompute the stored totals from the basket lines.
+        """
+        return self.update(**Basket.line_aggregates())
+
 
 class Basket(TimeStampedModel):
     """
@@ -32,9 +133,41 @@ class Basket(TimeStampedModel):
     status = models.CharField(_("Status"), max_length=128, default=OPEN, choices=STATUS_CHOICES)
     date_submitted = models.DateTimeField(_("Date submitted"), null=True, blank=True)
 
+    # Aggregates of the basket lines, kept up to date whenever a line is
+    # added, changed or removed. `manage.py check_basket_totals` repairs drift.
+    total = models.DecimalField(_("Total"), decimal_places=2, max_digits=12, default=Decimal('0.00'))
+    num_lines = models.PositiveIntegerField(_("Number of lines"), default=0)
+    num_items = models.PositiveIntegerField(_("Number of items"), default=0)
+    currency = models.CharField(_("Currency"), max_length=12, null=True, blank=True)
+    totals_fields = ('total', 'num_lines', 'num_items', 'currency')
+
+    objects = BasketQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            # A user has at most one open basket.
+            models.UniqueConstraint(fields=['user'], condition=Q(status="Open"), name='cart_basket_unique_open'),
+        ]
+
     # Only if a basket is in one of these statuses can it be edited
     editable_statuses = (OPEN, SAVED)
 
+    @staticmethod
+    def line_aggregates():
+        """
+        Expressions computing the totals of a basket from its lines, for use
+        in `annotate()` or `update()` of a basket queryset.
+        """
+        lines = Line.objects.filter(basket=OuterRef('pk')).order_by().values('basket')
+        return {
+            'num_lines': Coalesce(Subquery(lines.annotate(n=Count('pk')).values('n')), 0),
+            'num_items': Coalesce(Subquery(lines.annotate(n=Sum('quantity')).values('n')), 0),
+            'total': Coalesce(
+                Subquery(lines.annotate(n=Sum(F('price') * F('quantity'), output_field=PRICE_FIELD)).values('n')),
+                Value(Decimal('0.00')), output_field=PRICE_FIELD),
+            'currency': Subquery(Line.objects.filter(basket=OuterRef('pk')).values('currency')[:1]),
+        }
+
     def __str__(self):
         return _(
             "%(status)s basket (user: %(user)s, lines: %(num_lines)d)") \
@@ -47,7 +180,9 @@ class Basket(TimeStampedModel):
 
     def add_product(self, product, quantity=1):
         """
-        Add a product to the basket
+        Add a product to the basket, a negative quantity removes items.
+        The line and the basket totals are changed in a single statement,
+        which only applies while the basket can be edited.
         """
         if not self.id:
             self.save()
@@ -55,21 +190,28 @@ class Basket(TimeStampedModel):
         if not product.price:
             raise ValidationError("Strategy hasn't found a price for product %s" % product)
 
-        defaults = {
+        params = {
+            'basket': self.pk,
+            'statuses': self.editable_statuses,
+            'product': product.pk,
             'quantity': quantity,
             'price': product.price,
             'currency': product.currency,
         }
         try:
-            line, created = self.lines.get_or_create(product=product, defaults=defaults)
-            if not created:
-                line.quantity = max(0, line.quantity + quantity)
-                line.save()
-                if line.quantity <= 0:
-                    line.delete()
+            with connection.cursor() as cursor:
+                cursor.execute(ADD_LINE_SQL if quantity >= 0 else REMOVE_LINE_SQL, params)
+                totals = cursor.fetchone()
         except Exception as e:
             raise ValidationError(str(e))
 
+        if totals is None:
+            self.refresh_from_db(fields=('status',))
+            if not self.can_be_edited:
+                raise ValidationError(_("You cannot modify a %s basket") % (self.status.lower(),))
+            raise ValidationError(_("%s is not in the basket") % (product,))
+        self.total, self.num_lines, self.num_items, self.currency = totals
+
     def submit(self):
         """
         Mark this basket as submitted
@@ -77,30 +219,11 @@ class Basket(TimeStampedModel):
         self.status = self.SUBMITTED
         self.date_submitted = now()
         self.save()
-
-    def _get_total(self):
-        """
-        For sum of each line of the basket and returning the total.
-        """
-        total = Decimal('0.00')
-        for line in self.lines.all():
-            try:
-                total += getattr(line, 'price') * getattr(line, 'quantity')
-            except ObjectDoesNotExist:
-                # Handle situation where the product may have been deleted
-                pass
-        return total
+        cache.delete(open_basket_cache_key(self.user_id))
 
     # ==========
     # Properties
 
-    @property
-    def total(self):
-        """
-        Return total line price
-        """
-        return self._get_total()
-
     @property
     def is_empty(self):
         """
@@ -108,20 +231,6 @@ class Basket(TimeStampedModel):
         """
         return self.id is None or self.num_lines == 0 or self.num_items == 0
 
-    @property
-    def num_lines(self):
-        """
-        Return number of lines.
-        """
-        return self.lines.all().count()
-
-    @property
-    def num_items(self):
-        """
-        Return number of items.
-        """
-        return sum(line.quantity for line in self.lines.all())
-
     @property
     def can_be_edited(self):
         """
@@ -129,11 +238,6 @@ class Basket(TimeStampedModel):
         """
         return self.status in self.editable_statuses
 
-    @property
-    def currency(self):
-        for line in self.lines.all():
-            return line.currency
-
 
 class Line(TimeStampedModel):
     """
@@ -158,6 +262,16 @@ class Line(TimeStampedModel):
     class Meta:
         # Enforce sorting by order of creation.
         ordering = ['created', 'pk']
+        constraints = [
+            # `Basket.add_product` upserts on it.
+            models.UniqueConstraint(fields=['basket', 'product'], name='cart_line_unique_product'),
+        ]
+
+    @property
+    def line_total(self):
+        if self.price is None:
+            return Decimal('0.00')
+        return self.price * self.quantity
 
     def __str__(self):
         return _(
@@ -172,3 +286,9 @@ class Line(TimeStampedModel):
                 _("You cannot modify a %s basket") % (
                     self.basket.status.lower(),))
         return super().save(*args, **kwargs)
+
+
+@receiver(post_delete, sender=Line)
+def remove_line_from_totals(sender, instance=None, **kwargs):
+    Basket.objects.filter(pk=instance.basket_id).update_totals(
+        num_lines=-1, num_items=-instance.quantity, total=-instance.line_total)
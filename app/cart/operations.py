@@ -1,9 +1,83 @@
-from app.cart.models import Basket
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils.timezone import now
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+
+from app.cart.models import Basket, Line, open_basket_cache_key
+from app.cart.serializers import BasketOperationSerializer
+
+# Deletes the lines without the `post_delete` signal, which would update the
+# basket totals once per line before they are recalculated.
+DELETE_LINES_SQL = "DELETE FROM cart_line WHERE id = ANY(%(lines)s)"
 
 
 def get_user_basket(user):
     """
     get basket for a user.
+    The id of the open basket is cached, so usually this is a single primary
+    key fetch. `Basket.submit()` drops the cached id.
     """
+    key = open_basket_cache_key(user.pk)
+    basket_id = cache.get(key)
+    if basket_id is not None:
+        try:
+            return Basket.objects.get(pk=basket_id, user=user, status=Basket.OPEN)
+        except Basket.DoesNotExist:
+            pass
+
     basket, __ = Basket.objects.get_or_create(user=user, status=Basket.OPEN)
+    cache.set(key, basket.pk, settings.OPEN_BASKET_CACHE_TIMEOUT)
+    return basket
+
+
+def apply_basket_operations(basket, operations):
+    """
+    Apply a batch of validated add/set/remove operations to a basket in one
+    transaction, with a bulk insert, a bulk update and a bulk delete of the
+    lines followed by a single recalculation of the basket totals.
+    """
+    with transaction.atomic():
+        basket = Basket.objects.select_for_update().get(pk=basket.pk)
+        if not basket.can_be_edited:
+            raise ValidationError(_("You cannot modify a %s basket") % (basket.status.lower(),))
+
+        products = {operation["product"].pk: operation["product"] for operation in operations}
+        lines = {line.product_id: line for line in basket.lines.filter(product_id__in=products)}
+        quantities = {product_id: line.quantity for product_id, line in lines.items()}
+        for operation in operations:
+            product_id = operation["product"].pk
+            if operation["op"] == BasketOperationSerializer.ADD:
+                quantities[product_id] = quantities.get(product_id, 0) + operation["quantity"]
+            elif operation["op"] == BasketOperationSerializer.SET:
+                quantities[product_id] = operation["quantity"]
+            else:
+                quantities[product_id] = 0
+
+        created, updated, deleted = [], [], []
+        for product_id, quantity in quantities.items():
+            line = lines.get(product_id)
+            if line is None:
+                if quantity > 0:
+                    product = products[product_id]
+                    created.append(Line(
+                        basket=basket, product=product, quantity=quantity,
+                        price=product.price, currency=product.currency))
+            elif quantity <= 0:
+                deleted.append(line.pk)
+            elif quantity != line.quantity:
+                line.quantity = quantity
+                line.modified = now()
+                updated.append(line)
+
+        if created:
+            Line.objects.bulk_create(created)
+        if updated:
+            Line.objects.bulk_update(updated, ['quantity', 'modified'])
+        if deleted:
+            with connection.cursor() as cursor:
+                cursor.execute(DELETE_LINES_SQL, {'lines': deleted})
+        Basket.objects.filter(pk=basket.pk).recalculate_totals()
+        basket.refresh_from_db(fields=Basket.totals_fields)
     return basket
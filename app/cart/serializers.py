@@ -1,7 +1,11 @@
 from django.contrib.auth import get_user_model
+from django.db.models import prefetch_related_objects
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from app.base.serializers import ValuesSerializer
 from app.cart.models import Basket, Line
+from app.catalogue.models import Product
 
 User = get_user_model()
 
@@ -26,6 +30,10 @@ class BasketLineSerializer(serializers.ModelSerializer):
 
 
 class BasketSerializer(serializers.ModelSerializer):
+    """
+    Reads the lines once, every other field is a stored basket column. Use
+    `setup_eager_loading` to load the lines of the baskets to serialize.
+    """
     lines = BasketLineSerializer(many=True, read_only=True)
     total = serializers.DecimalField(decimal_places=2, max_digits=12, required=False)
     currency = serializers.CharField(required=False)
@@ -41,3 +49,73 @@ class BasketSerializer(serializers.ModelSerializer):
             "total",
             "currency",
         )
+
+    @staticmethod
+    def setup_eager_loading(baskets):
+        """
+        Load the lines of the given basket instances with a single query.
+        """
+        prefetch_related_objects(baskets, 'lines')
+        return baskets
+
+
+class BasketLineValuesSerializer(ValuesSerializer):
+    serializer_class = BasketLineSerializer
+
+
+class BasketValuesSerializer(ValuesSerializer):
+    """
+    Renders a basket like `BasketSerializer`, reading its lines with one
+    `values()` query instead of loading `Line` instances.
+    """
+    serializer_class = BasketSerializer
+    line_serializer = BasketLineValuesSerializer()
+
+    def basket_to_representation(self, basket):
+        lines = self.line_serializer.many_to_representation(Line.objects.filter(basket=basket))
+        return self.instance_to_representation(basket, lines=lines)
+
+
+class BasketOperationSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """
+    One change of a batch basket update.
+    `add` adds `quantity` items, `set` sets the quantity of the line and
+    `remove` removes the line.
+    """
+    ADD, SET, REMOVE = ('add', 'set', 'remove')
+
+    op = serializers.ChoiceField(choices=(ADD, SET, REMOVE))
+    product = serializers.UUIDField()
+    quantity = serializers.IntegerField(min_value=0, required=False, default=1)
+
+
+class BasketBatchSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """
+    Validates a batch of basket operations. All the products are fetched with
+    a single query.
+    """
+    max_operations = 500
+
+    operations = BasketOperationSerializer(many=True, allow_empty=False)
+
+    def validate_operations(self, operations):
+        if len(operations) > self.max_operations:
+            raise serializers.ValidationError(
+                _("A batch can contain at most %d operations.") % self.max_operations)
+        return operations
+
+    def validate(self, attrs):
+        operations = attrs["operations"]
+        products = Product.objects.in_bulk({operation["product"] for operation in operations})
+        for operation in operations:
+            product = products.get(operation["product"])
+            if product is None:
+                raise serializers.ValidationError(_("Product %s does not exist.") % operation["product"])
+            # Products withdrawn from sale, or without a price, can still be removed.
+            if operation["op"] != BasketOperationSerializer.REMOVE:
+                if not product.is_public:
+                    raise serializers.ValidationError(_("Product %s not available for sale.") % operation["product"])
+                if not product.price:
+                    raise serializers.ValidationError(_("Product %s has no price.") % operation["product"])
+            operation["product"] = product
+        return attrs
@@ -19,7 +19,6 @@ class LineFactory(factory.django.DjangoModelFactory):
 
     class Meta:
         model = 'cart.Line'
-        django_get_or_create = ('id',)
 
     currency = 'INR'
     price = 100
@@ -0,0 +1,181 @@
+import threading
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from nose.tools import eq_, ok_
+from rest_framework.exceptions import ValidationError
+
+from ...catalogue.test.factories import ProductFactory
+from ..models import Basket
+from .factories import BasketFactory, LineFactory
+
+
+class BasketTotalsTestCase(TestCase):
+    """
+    The stored basket totals follow the changes of the lines.
+    """
+
+    def setUp(self):
+        self.basket = BasketFactory()
+        self.product1 = ProductFactory(price=100)
+        self.product2 = ProductFactory(price=Decimal('2.50'), currency='USD')
+
+    def assert_totals(self, total, num_lines, num_items):
+        for basket in (self.basket, Basket.objects.get(pk=self.basket.pk)):
+            eq_(basket.total, Decimal(total))
+            eq_(basket.num_lines, num_lines)
+            eq_(basket.num_items, num_items)
+
+    def test_empty_basket(self):
+        self.assert_totals('0.00', 0, 0)
+        ok_(self.basket.is_empty)
+        eq_(self.basket.currency, None)
+
+    def test_add_products(self):
+        self.basket.add_product(self.product1, 2)
+        self.basket.add_product(self.product2, 4)
+        self.basket.add_product(self.product1, 1)
+        self.assert_totals('310.00', 2, 7)
+        eq_(self.basket.currency, 'INR')
+        ok_(not self.basket.is_empty)
+
+    def test_remove_products(self):
+        self.basket.add_product(self.product1, 2)
+        self.basket.add_product(self.product2, 4)
+        self.basket.add_product(self.product2, -1)
+        self.assert_totals('207.50', 2, 5)
+
+        self.basket.add_product(self.product1, -5)
+        self.assert_totals('7.50', 1, 3)
+        eq_(self.basket.lines.count(), 1)
+
+    def test_remove_first_currency(self):
+        self.basket.add_product(self.product2, 1)
+        self.basket.add_product(self.product1, 1)
+        eq_(self.basket.currency, 'USD')
+        self.basket.add_product(self.product2, -1)
+        eq_(self.basket.currency, 'INR')
+        eq_(Basket.objects.get(pk=self.basket.pk).currency, 'INR')
+
+        self.basket.add_product(self.product2, 1)
+        self.basket.add_product(self.product1, -1)
+        eq_(self.basket.currency, 'USD')
+
+    def test_delete_first_currency(self):
+        self.basket.add_product(self.product2, 1)
+        self.basket.add_product(self.product1, 1)
+        self.basket.lines.filter(product=self.product2).delete()
+        self.basket.refresh_from_db()
+        eq_(self.basket.currency, 'INR')
+
+    def test_delete_lines(self):
+        self.basket.add_product(self.product1, 2)
+        self.basket.add_product(self.product2, 4)
+        self.basket.lines.filter(product=self.product1).delete()
+        self.basket.refresh_from_db()
+        self.assert_totals('10.00', 1, 4)
+
+        self.basket.lines.all().delete()
+        self.basket.refresh_from_db()
+        self.assert_totals('0.00', 0, 0)
+        eq_(self.basket.currency, None)
+
+
+class CheckBasketTotalsCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.basket = BasketFactory()
+        # Lines saved directly bypass the totals bookkeeping.
+        LineFactory(basket=self.basket, price=100, quantity=5)
+
+    def test_reports_drift(self):
+        out = StringIO()
+        call_command('check_basket_totals', stdout=out)
+        ok_(f"Basket #{self.basket.pk}" in out.getvalue())
+        self.basket.refresh_from_db()
+        eq_(self.basket.total, Decimal('0.00'))
+
+    def test_fix_drift(self):
+        call_command('check_basket_totals', '--fix', stdout=StringIO())
+        self.basket.refresh_from_db()
+        eq_(self.basket.total, Decimal('500.00'))
+        eq_(self.basket.num_lines, 1)
+        eq_(self.basket.num_items, 5)
+        eq_(self.basket.currency, 'INR')
+
+        out = StringIO()
+        call_command('check_basket_totals', stdout=out)
+        ok_("up to date" in out.getvalue())
+
+    def test_empty_basket_is_not_reported(self):
+        empty = BasketFactory()
+        eq_(empty.currency, None)
+
+        out = StringIO()
+        call_command('check_basket_totals', '--fix', stdout=out)
+        ok_(f"Basket #{empty.pk}" not in out.getvalue())
+        ok_("Repaired 1 basket(s)" in out.getvalue())
+
+    def test_reports_currency_drift(self):
+        call_command('check_basket_totals', '--fix', stdout=StringIO())
+        Basket.objects.filter(pk=self.basket.pk).update(currency='USD')
+
+        out = StringIO()
+        call_command('check_basket_totals', stdout=out)
+        ok_("currency USD != INR" in out.getvalue())
+
+
+class AddProductTestCase(TestCase):
+
+    def setUp(self):
+        self.basket = BasketFactory()
+        self.product = ProductFactory(price=100)
+
+    def test_add_product_is_one_query(self):
+        self.basket.add_product(self.product, 1)
+        with self.assertNumQueries(1):
+            self.basket.add_product(self.product, 2)
+        eq_(self.basket.lines.get().quantity, 3)
+
+    def test_add_product_to_submitted_basket(self):
+        self.basket.submit()
+        with self.assertRaises(ValidationError):
+            self.basket.add_product(self.product, 1)
+        eq_(self.basket.lines.count(), 0)
+
+    def test_remove_product_not_in_basket(self):
+        with self.assertRaises(ValidationError):
+            self.basket.add_product(self.product, -1)
+        self.assert_empty()
+
+    def assert_empty(self):
+        self.basket.refresh_from_db()
+        eq_(self.basket.num_lines, 0)
+
+
+class ConcurrentAddProductTestCase(TransactionTestCase):
+
+    def test_concurrent_adds_merge_into_one_line(self):
+        basket = BasketFactory()
+        product = ProductFactory(price=100)
+
+        def add():
+            try:
+                Basket.objects.get(pk=basket.pk).add_product(product, 1)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=add) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        basket.refresh_from_db()
+        eq_(basket.lines.get().quantity, 8)
+        eq_(basket.num_lines, 1)
+        eq_(basket.num_items, 8)
+        eq_(basket.total, Decimal('800.00'))
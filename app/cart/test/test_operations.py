@@ -0,0 +1,42 @@
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import TestCase
+from nose.tools import eq_, ok_
+
+from ...users.test.factories import UserFactory
+from ..models import Basket
+from ..operations import get_user_basket
+
+
+class GetUserBasketTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+
+    def test_creates_open_basket(self):
+        basket = get_user_basket(self.user)
+        eq_(basket.status, Basket.OPEN)
+        eq_(basket.user, self.user)
+
+    def test_cached_basket_is_one_query(self):
+        basket = get_user_basket(self.user)
+        with self.assertNumQueries(1):
+            eq_(get_user_basket(self.user), basket)
+
+    def test_submit_invalidates_cached_basket(self):
+        basket = get_user_basket(self.user)
+        basket.submit()
+        new_basket = get_user_basket(self.user)
+        ok_(new_basket.pk != basket.pk)
+        eq_(new_basket.status, Basket.OPEN)
+
+    def test_stale_cached_basket_is_ignored(self):
+        basket = get_user_basket(self.user)
+        Basket.objects.filter(pk=basket.pk).update(status=Basket.FROZEN)
+        ok_(get_user_basket(self.user).pk != basket.pk)
+
+    def test_one_open_basket_per_user(self):
+        get_user_basket(self.user)
+        with self.assertRaises(IntegrityError):
+            Basket.objects.create(user=self.user, status=Basket.OPEN)
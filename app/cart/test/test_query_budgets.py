@@ -0,0 +1,60 @@
+from django.core.cache import cache
+from django.urls import reverse
+from nose.tools import eq_
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ...base.test.query_budget import QueryBudgetMixin
+from ...catalogue.test.factories import ProductFactory
+from ...users.test.factories import UserFactory
+from ..models import Basket
+
+
+class BasketQueryBudgetTestCase(QueryBudgetMixin, APITestCase):
+    """
+    The basket endpoints run a fixed number of queries whatever the size of
+    the basket.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('basket')
+        self.user = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+        # Authenticate and create the basket outside of the budgets.
+        self.client.get(self.url)
+        self.basket = Basket.objects.get(user=self.user, status=Basket.OPEN)
+
+    def grow_basket(self, size):
+        for _ in range(size - self.basket.lines.count()):
+            self.basket.add_product(ProductFactory(), 2)
+
+    def test_get_basket(self):
+        def request(_):
+            eq_(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        self.assertQueryBudget('basket-get', self.grow_basket, request)
+
+    def test_add_to_basket(self):
+        def grow(size):
+            self.grow_basket(size)
+            return ProductFactory()
+
+        def request(product):
+            response = self.client.post(self.url, {"product": product.id, "quantity": 1})
+            eq_(response.status_code, status.HTTP_200_OK)
+        self.assertQueryBudget('basket-post', grow, request)
+
+    def test_batch_update_basket(self):
+        def grow(size):
+            self.grow_basket(2 * size)
+            lines = list(self.basket.lines.order_by('created')[:2 * size])
+            operations = [{"op": "add", "product": str(ProductFactory().id), "quantity": 1} for _ in range(size)]
+            operations += [
+                {"op": "set", "product": str(line.product_id), "quantity": line.quantity + 1} for line in lines[::2]]
+            operations += [{"op": "remove", "product": str(line.product_id)} for line in lines[1::2]]
+            return operations
+
+        def request(operations):
+            response = self.client.post(reverse('basket-batch'), {"operations": operations}, format='json')
+            eq_(response.status_code, status.HTTP_200_OK)
+        self.assertQueryBudget('basket-batch', grow, request)
@@ -0,0 +1,33 @@
+import json
+
+from django.test import TestCase
+from nose.tools import eq_
+from rest_framework.renderers import JSONRenderer
+
+from ...catalogue.test.factories import ProductFactory
+from ..models import Basket
+from ..serializers import BasketSerializer, BasketValuesSerializer
+from .factories import BasketFactory, LineFactory
+
+
+def render(data):
+    return json.loads(JSONRenderer().render(data))
+
+
+class BasketValuesSerializerTestCase(TestCase):
+    """
+    Tests that `BasketValuesSerializer` renders baskets like `BasketSerializer`.
+    """
+
+    def test_same_representation(self):
+        basket = BasketFactory()
+        empty = Basket.objects.get(pk=basket.pk)
+        eq_(render(BasketValuesSerializer().basket_to_representation(empty)), render(BasketSerializer(empty).data))
+
+        basket.add_product(ProductFactory(price='10.50'), 3)
+        LineFactory(basket=basket, price=None, currency='USD')
+        basket = Basket.objects.get(pk=basket.pk)
+        data = render(BasketValuesSerializer().basket_to_representation(basket))
+        eq_(data, render(BasketSerializer(basket).data))
+        eq_(list(data), ["id", "user", "status", "lines", "total", "currency"])
+        eq_(len(data["lines"]), 2)
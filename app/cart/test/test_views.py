@@ -1,3 +1,6 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from faker import Faker
 from nose.tools import eq_
@@ -6,6 +9,7 @@ from rest_framework.test import APITestCase
 
 from ...catalogue.test.factories import ProductFactory
 from ...users.test.factories import UserFactory
+from ..models import Basket
 
 fake = Faker()
 
@@ -81,3 +85,119 @@ class AddRetrieveBasketTestCase(APITestCase):
         self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
         response = self.client.get(self.url)
         eq_(response.status_code, status.HTTP_200_OK)
+
+
+class BatchUpdateBasketTestCase(APITestCase):
+    """
+    Tests /cart/batch post operation.
+    """
+
+    def setUp(self):
+        self.url = reverse('basket-batch')
+        self.user = UserFactory()
+        self.products = [ProductFactory() for _ in range(3)]
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+
+    def post(self, operations):
+        return self.client.post(self.url, {"operations": operations}, format='json')
+
+    def quantities(self, response):
+        return {str(line["product"]): line["quantity"] for line in response.data["lines"]}
+
+    def test_batch_anonymous(self):
+        self.client.credentials()
+        response = self.post([{"op": "add", "product": self.products[0].id}])
+        eq_(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_batch_operations(self):
+        p1, p2, p3 = self.products
+        response = self.post([
+            {"op": "add", "product": p1.id, "quantity": 2},
+            {"op": "add", "product": p2.id, "quantity": 1},
+            {"op": "add", "product": p3.id, "quantity": 1},
+        ])
+        eq_(response.status_code, status.HTTP_200_OK)
+        eq_(self.quantities(response), {p1.pk: 2, p2.pk: 1, p3.pk: 1})
+
+        response = self.post([
+            {"op": "add", "product": p1.id, "quantity": 3},
+            {"op": "set", "product": p2.id, "quantity": 7},
+            {"op": "remove", "product": p3.id},
+        ])
+        eq_(response.status_code, status.HTTP_200_OK)
+        eq_(self.quantities(response), {p1.pk: 5, p2.pk: 7})
+        eq_(response.data["total"], "1200.00")
+
+    def test_batch_resolves_products_in_one_query(self):
+        operations = [{"op": "add", "product": product.id, "quantity": 1} for product in self.products]
+        with CaptureQueriesContext(connection) as queries:
+            self.post(operations)
+        product_queries = [q for q in queries if 'FROM "catalogue_product"' in q["sql"]]
+        eq_(len(product_queries), 1)
+
+    def test_batch_with_unknown_product(self):
+        response = self.post([{"op": "add", "product": fake.uuid4(), "quantity": 1}])
+        eq_(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
+    def test_batch_with_not_public_product(self):
+        product = ProductFactory(is_public=False)
+        response = self.post([{"op": "add", "product": product.id, "quantity": 1}])
+        eq_(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
+    def test_batch_remove_not_public_product(self):
+        p1, p2, __ = self.products
+        self.post([
+            {"op": "add", "product": p1.id, "quantity": 1},
+            {"op": "add", "product": p2.id, "quantity": 1},
+        ])
+        p1.is_public = False
+        p1.save()
+        response = self.post([{"op": "remove", "product": p1.id}])
+        eq_(response.status_code, status.HTTP_200_OK)
+        eq_(self.quantities(response), {p2.pk: 1})
+
+    def test_batch_with_wrong_data(self):
+        response = self.post([{"op": "add", "product": self.products[0].id, "quantity": -1}])
+        eq_(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        response = self.post([])
+        eq_(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
+
+class BasketQueryCountTestCase(APITestCase):
+    """
+    Reading the basket costs the same number of queries whatever its size.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('basket')
+        self.user = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+        self.client.get(self.url)
+
+    def count_queries(self, method, *args, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            response = method(self.url, *args, **kwargs)
+        eq_(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def fill_basket(self, num_lines):
+        basket = Basket.objects.get(user=self.user, status=Basket.OPEN)
+        for _ in range(num_lines):
+            basket.add_product(ProductFactory(), 2)
+
+    def test_get_basket_query_count(self):
+        self.fill_basket(1)
+        small = self.count_queries(self.client.get)
+        self.fill_basket(20)
+        large = self.count_queries(self.client.get)
+        # basket, lines; the token was cached by the request of setUp
+        eq_(small, 2)
+        eq_(large, small)
+
+    def test_post_basket_query_count(self):
+        self.fill_basket(1)
+        small = self.count_queries(self.client.post, {"product": ProductFactory().id, "quantity": 1})
+        self.fill_basket(20)
+        large = self.count_queries(self.client.post, {"product": ProductFactory().id, "quantity": 1})
+        eq_(large, small)
@@ -4,5 +4,6 @@ from . import views
 
 urlpatterns = [
     # ex: /polls/
-    path('', views.BasketRetrieveCreate.as_view(), name='basket')
+    path('', views.BasketRetrieveCreate.as_view(), name='basket'),
+    path('batch/', views.BasketBatchUpdate.as_view(), name='basket-batch'),
 ]
@@ -3,8 +3,9 @@ from rest_framework.generics import GenericAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from app.cart.operations import get_user_basket
-from app.cart.serializers import BasketSerializer
+from app.cart.operations import apply_basket_operations, get_user_basket
+from app.cart.serializers import (BasketBatchSerializer, BasketSerializer,
+                                  BasketValuesSerializer)
 from app.catalogue.serializers import AddProductSerializer
 
 
@@ -21,6 +22,7 @@ class BasketRetrieveCreate(GenericAPIView):
     permission_classes = (IsAuthenticated,)
     add_product_serializer_class = AddProductSerializer
     serializer_class = BasketSerializer
+    values_serializer = BasketValuesSerializer()
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
@@ -30,8 +32,7 @@ class BasketRetrieveCreate(GenericAPIView):
 
     def get(self, request, *args, **kwargs):  # pylint: disable=redefined-builtin
         basket = get_user_basket(request.user)
-        ser = self.serializer_class(basket, context={"request": request})
-        return Response(ser.data)
+        return Response(self.values_serializer.basket_to_representation(basket))
 
     def validate(self, basket, product, quantity):  # pylint: disable=unused-argument
         # if not quantity > 0:
@@ -56,6 +57,30 @@ class BasketRetrieveCreate(GenericAPIView):
                 )
 
             basket.add_product(product, quantity=quantity)
-            ser = self.serializer_class(basket, context={"request": request})
-            return Response(ser.data)
+            return Response(self.values_serializer.basket_to_representation(basket))
         return Response({"reason": p_ser.errors}, status=status.HTTP_406_NOT_ACCEPTABLE)
+
+
+class BasketBatchUpdate(GenericAPIView):
+    """
+    POST: Apply several changes to your basket at once and get the basket back.
+    POST(url, operations)
+    {
+        "operations": [
+            {"op": "add", "product": "id", "quantity": 2},
+            {"op": "set", "product": "id", "quantity": 5},
+            {"op": "remove", "product": "id"}
+        ]
+    }
+    """
+    permission_classes = (IsAuthenticated,)
+    serializer_class = BasketBatchSerializer
+    values_serializer = BasketValuesSerializer()
+
+    def post(self, request, *args, **kwargs):  # pylint: disable=redefined-builtin
+        b_ser = self.serializer_class(data=request.data, context={"request": request})
+        if b_ser.is_valid():
+            basket = get_user_basket(request.user)
+            basket = apply_basket_operations(basket, b_ser.validated_data["operations"])
+            return Response(self.values_serializer.basket_to_representation(basket))
+        return Response({"reason": b_ser.errors}, status=status.HTTP_406_NOT_ACCEPTABLE)
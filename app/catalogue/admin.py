@@ -17,4 +17,10 @@ class ProductAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related('product_class')
+        return qs.select_related('product_class').defer('search_vector')
+
+    def get_search_results(self, request, queryset, search_term):
+        # Use the full text index instead of an `ILIKE '%term%'` scan.
+        if not search_term:
+            return queryset, False
+        return queryset.search(search_term), False
@@ -0,0 +1,167 @@
+"""
+Bulk product import from CSV or JSON lines feeds.
+
+Rows are read lazily, converted in batches and written with one
+`INSERT ... ON CONFLICT (id) DO UPDATE` statement per batch, so re-importing
+a feed updates the existing products instead of duplicating them. Rows
+without an id are matched to the existing products on their slug. The search
+vector is maintained by the database trigger on `catalogue_product`.
+"""
+import csv
+import json
+import uuid
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import connection
+from django.utils.text import slugify
+from django.utils.timezone import now
+from psycopg2.extras import execute_values
+
+from app.catalogue.models import Product, ProductClass
+
+CSV, JSONL = ('csv', 'jsonl')
+FORMATS = (CSV, JSONL)
+BATCH_SIZE = 5000
+COLUMNS = ('id', 'created', 'modified', 'is_public', 'title', 'slug', 'description', 'currency', 'price',
+           'product_class_id')
+# Every column but `id` and `created` is replaced on re-import.
+UPSERT_SQL = f"""
+INSERT INTO catalogue_product ({', '.join(COLUMNS)})
+VALUES %s
+ON CONFLICT (id) DO UPDATE SET
+{', '.join(f'{column} = EXCLUDED.{column}' for column in COLUMNS[2:])}
+RETURNING xmax = 0 AS created
+"""
+TRUE_VALUES = ('1', 'true', 't', 'yes', 'y')
+# The ids of new products without an id in the feed derive from their slug,
+# so that importing the feed again finds them.
+SLUG_NAMESPACE = uuid.UUID('5f0b8a4e-4c55-4d0c-8f6e-2f1a9e3c7d21')
+MAX_LENGTHS = {name: Product._meta.get_field(name).max_length for name in ('title', 'slug', 'currency')}
+
+
+class ProductImportError(ValueError):
+    """
+    A row of the feed cannot be imported.
+    """
+
+    def __init__(self, row_number, message):
+        super().__init__(f"Row {row_number}: {message}")
+
+
+def read_rows(stream, fmt):
+    """
+    Yield the rows of a CSV (with a header) or JSON lines stream as dicts.
+    """
+    if fmt == CSV:
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def to_bool(value, default=True):
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def row_slug(row):
+    return row.get('slug') or slugify((row.get('title') or '').strip())
+
+
+def ids_by_slug(rows):
+    """
+    The ids of the existing products with the slug of a row without an id.
+    """
+    slugs = {row_slug(row) for row in rows if not row.get('id')}
+    ids = defaultdict(list)
+    for slug, product_id in Product.objects.filter(slug__in=slugs).values_list('slug', 'pk'):
+        ids[slug].append(product_id)
+    return ids
+
+
+def build_batch(rows, product_classes, start, timestamp, existing=None):
+    """
+    Convert feed rows to `COLUMNS` tuples, keyed by product id so that a
+    product repeated within a batch is written once, last row winning.
+    `existing` maps slugs to the ids of the products having them, see
+    `ids_by_slug`.
+    """
+    existing = existing or {}
+    products = {}
+    for row_number, row in enumerate(rows, start):
+        title = (row.get('title') or '').strip()
+        if not title:
+            raise ProductImportError(row_number, "a title is required")
+        slug = row_slug(row)
+        values = {'title': title, 'slug': slug, 'currency': row.get('currency') or 'INR'}
+        for name, max_length in MAX_LENGTHS.items():
+            if len(values[name]) > max_length:
+                raise ProductImportError(row_number, f"the {name} is longer than {max_length} characters")
+        if row.get('id'):
+            try:
+                product_id = uuid.UUID(str(row['id']))
+            except ValueError:
+                raise ProductImportError(row_number, f"invalid id {row['id']!r}")
+        elif not slug:
+            raise ProductImportError(row_number, "an id or a slug is required")
+        elif len(existing.get(slug, ())) > 1:
+            raise ProductImportError(row_number, f"several products have the slug {slug!r}, an id is required")
+        elif slug in existing:
+            product_id = existing[slug][0]
+        else:
+            product_id = uuid.uuid5(SLUG_NAMESPACE, slug)
+        price = row.get('price')
+        try:
+            price = Decimal(str(price)) if price not in (None, '') else None
+        except InvalidOperation:
+            raise ProductImportError(row_number, f"invalid price {price!r}")
+        product_class_id = None
+        if row.get('product_class'):
+            try:
+                product_class_id = product_classes[row['product_class']]
+            except KeyError:
+                raise ProductImportError(row_number, f"unknown product class {row['product_class']!r}")
+
+        products[product_id] = (
+            product_id,
+            timestamp,
+            timestamp,
+            to_bool(row.get('is_public')),
+            title,
+            slug,
+            row.get('description') or '',
+            values['currency'],
+            price,
+            product_class_id,
+        )
+    return list(products.values())
+
+
+def import_products(rows, batch_size=BATCH_SIZE):
+    """
+    Upsert the products of `rows` in batches of `batch_size`, returning the
+    number of products created and updated. Each batch is committed on its
+    own, so a feed that fails halfway can simply be imported again.
+    """
+    product_classes = dict(ProductClass.objects.values_list('slug', 'pk'))
+    created = updated = 0
+    rows = iter(rows)
+    start = 1
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        products = build_batch(batch, product_classes, start, now(), ids_by_slug(batch))
+        start += len(batch)
+        with connection.cursor() as cursor:
+            results = execute_values(cursor.cursor, UPSERT_SQL, products, page_size=len(products), fetch=True)
+        inserted = sum(1 for (is_created,) in results if is_created)
+        created += inserted
+        updated += len(results) - inserted
+    return created, updated
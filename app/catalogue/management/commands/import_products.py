@@ -0,0 +1,34 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.catalogue import imports
+
+
+class Command(BaseCommand):
+    help = (
+        "Import products from a CSV (with a header row) or JSON lines file. Columns: id, title, slug, "
+        "description, currency, price, is_public and product_class (a product class slug). Products with a "
+        "known id are updated."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format', choices=imports.FORMATS,
+            help="Format of the file, guessed from its extension by default.")
+        parser.add_argument('--batch-size', type=int, default=imports.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or os.path.splitext(options['path'])[1].lstrip('.').lower()
+        if fmt not in imports.FORMATS:
+            raise CommandError(f"Cannot guess the format of {options['path']}, use --format.")
+
+        with open(options['path'], newline='') as stream:
+            try:
+                created, updated = imports.import_products(imports.read_rows(stream, fmt), options['batch_size'])
+            except ValueError as error:
+                # Invalid rows as well as malformed JSON lines.
+                raise CommandError(str(error))
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {created + updated} products ({created} created, {updated} updated)."))
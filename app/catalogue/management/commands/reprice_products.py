@@ -0,0 +1,31 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.catalogue.pricing import reprice_products
+from app.catalogue.serializers import RepriceSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Set product prices from a CSV file with `product`, `price` and optionally `currency` columns, "
+        "and refresh the lines of the open and saved baskets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+
+    def handle(self, *args, **options):
+        with open(options['path'], newline='') as stream:
+            prices = [
+                {key: value for key, value in row.items() if value not in (None, '')}
+                for row in csv.DictReader(stream)
+            ]
+
+        ser = RepriceSerializer(data={"prices": prices})
+        ser.max_prices = len(prices)
+        if not ser.is_valid():
+            raise CommandError(ser.errors)
+        products, baskets = reprice_products(
+            (price["product"], price["price"], price["currency"]) for price in ser.validated_data["prices"])
+        self.stdout.write(self.style.SUCCESS(f"Repriced {products} products, {baskets} baskets updated."))
@@ -0,0 +1,17 @@
+# Generated by Django 3.0.8 on 2026-10-18 12:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0003_auto_20200801_0846'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['is_public', 'created', 'id'], name='catalogue_product_listing'),
+        ),
+    ]
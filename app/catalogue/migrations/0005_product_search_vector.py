@@ -0,0 +1,49 @@
+# Generated by Django 3.0.8 on 2026-10-18 12:26
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Keeps `search_vector` in sync with title/description on every write,
+# including bulk inserts and raw SQL that bypass `Product.save()`.
+CREATE_TRIGGER = """
+CREATE FUNCTION catalogue_product_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER catalogue_product_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, description ON catalogue_product
+FOR EACH ROW EXECUTE PROCEDURE catalogue_product_search_vector_update();
+
+UPDATE catalogue_product SET title = title;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS catalogue_product_search_vector_trigger ON catalogue_product;
+DROP FUNCTION IF EXISTS catalogue_product_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0004_product_listing_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='catalogue_product_search'),
+        ),
+    ]
@@ -1,5 +1,8 @@
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVectorField)
 from django.db import models
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
@@ -28,6 +31,30 @@ class ProductClass(models.Model):
         return self.name
 
 
+# Text search configuration used to build and query `Product.search_vector`.
+SEARCH_CONFIG = 'english'
+
+
+class ProductQuerySet(models.QuerySet):
+
+    def public(self):
+        """
+        Products that can be shown in catalogue listings.
+        """
+        return self.filter(is_public=True)
+
+    def search(self, query):
+        """
+        Full text search over title and description, best matches first.
+        Uses the `search_vector` column, which is kept up to date by a
+        database trigger (see migration 0005).
+        """
+        query = SearchQuery(query, config=SEARCH_CONFIG)
+        return self.filter(search_vector=query).annotate(
+            rank=SearchRank(models.F('search_vector'), query)
+        ).order_by('-rank', '-created')
+
+
 class Product(TimeStampedModel):
     """
     The base product object
@@ -53,12 +80,19 @@ class Product(TimeStampedModel):
         on_delete=models.PROTECT,
         verbose_name=_('Product type'), related_name="products",
         help_text=_("Choose what type of product this is"))
+    # Weighted title (A) and description (B) lexemes, maintained by a trigger.
+    search_vector = SearchVectorField(null=True, editable=False)
 
-    # objects = ProductQuerySet.as_manager()
+    objects = ProductQuerySet.as_manager()
 
     class Meta:
         app_label = 'catalogue'
         ordering = ['-created']
+        indexes = [
+            # Serves the keyset paginated public listing.
+            models.Index(fields=['is_public', 'created', 'id'], name='catalogue_product_listing'),
+            GinIndex(fields=['search_vector'], name='catalogue_product_search'),
+        ]
         verbose_name = _('Product')
         verbose_name_plural = _('Products')
 
@@ -0,0 +1,66 @@
+"""
+Set-based repricing of products.
+
+New prices are written with one `UPDATE ... FROM (VALUES ...)` statement and
+then copied to the lines of the baskets that can still be edited, whose
+totals are recomputed. Frozen and submitted baskets keep the prices they
+were checked out with.
+"""
+from django.db import connection, transaction
+from psycopg2.extras import execute_values
+
+from app.cart.models import Basket
+
+REPRICE_PRODUCTS_SQL = """
+UPDATE catalogue_product
+SET price = prices.price,
+    currency = coalesce(prices.currency, catalogue_product.currency),
+    modified = now()
+FROM (VALUES %s) AS prices (id, price, currency)
+WHERE catalogue_product.id = prices.id
+RETURNING catalogue_product.id
+"""
+REPRICE_TEMPLATE = '(%s::uuid, %s::numeric, %s::varchar)'
+
+# Baskets are locked before their lines, in id order, like every other
+# writer of basket lines does, so repricing cannot deadlock with them.
+REPRICE_LINES_SQL = """
+WITH basket AS (
+    SELECT id FROM cart_basket
+    WHERE status IN %(statuses)s
+      AND id IN (SELECT basket_id FROM cart_line WHERE product_id = ANY(%(products)s::uuid[]))
+    ORDER BY id
+    FOR UPDATE
+)
+UPDATE cart_line
+SET price = product.price, currency = product.currency, modified = now()
+FROM basket, catalogue_product AS product
+WHERE cart_line.basket_id = basket.id
+  AND cart_line.product_id = product.id
+  AND product.id = ANY(%(products)s::uuid[])
+  AND (cart_line.price IS DISTINCT FROM product.price OR cart_line.currency <> product.currency)
+RETURNING cart_line.basket_id
+"""
+
+
+def reprice_products(prices):
+    """
+    Set the prices of products from `(product id, price, currency)` tuples,
+    `currency` being optional (`None` keeps the current one), and refresh
+    the lines of the open and saved baskets holding them.
+    Returns the number of products and baskets updated.
+    """
+    prices = [(str(product_id), price, currency) for product_id, price, currency in prices]
+    if not prices:
+        return 0, 0
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        products = [product_id for (product_id,) in execute_values(
+            cursor.cursor, REPRICE_PRODUCTS_SQL, prices, template=REPRICE_TEMPLATE, page_size=len(prices),
+            fetch=True)]
+        if not products:
+            return 0, 0
+        cursor.execute(REPRICE_LINES_SQL, {'statuses': Basket.editable_statuses, 'products': products})
+        baskets = {basket_id for (basket_id,) in cursor.fetchall()}
+        Basket.objects.filter(pk__in=baskets).recalculate_totals()
+    return len(products), len(baskets)
@@ -1,8 +1,25 @@
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from app.catalogue.models import Product
 
 
+class ProductSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Product
+        fields = (
+            "id",
+            "title",
+            "slug",
+            "description",
+            "product_class",
+            "currency",
+            "price",
+            "created",
+        )
+
+
 class AddProductSerializer(serializers.Serializer):  # pylint: disable=abstract-method
     """
     Serializes and validates an add to basket request.
@@ -10,3 +27,35 @@ class AddProductSerializer(serializers.Serializer):  # pylint: disable=abstract-
 
     quantity = serializers.IntegerField(required=True)
     product = serializers.PrimaryKeyRelatedField(queryset=Product.objects)
+
+
+class ProductPriceSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """
+    The new price of a product, in its current currency unless one is given.
+    """
+
+    product = serializers.UUIDField()
+    price = serializers.DecimalField(decimal_places=2, max_digits=12, min_value=0)
+    currency = serializers.CharField(max_length=12, required=False, default=None)
+
+
+class RepriceSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """
+    Validates a batch of new product prices. The products are checked with a
+    single query.
+    """
+    max_prices = 10000
+
+    prices = ProductPriceSerializer(many=True, allow_empty=False)
+
+    def validate_prices(self, prices):
+        if len(prices) > self.max_prices:
+            raise serializers.ValidationError(_("A batch can contain at most %d prices.") % self.max_prices)
+        product_ids = [price["product"] for price in prices]
+        if len(set(product_ids)) != len(product_ids):
+            raise serializers.ValidationError(_("A product can only be repriced once per batch."))
+        missing = set(product_ids) - set(Product.objects.filter(pk__in=product_ids).values_list('pk', flat=True))
+        if missing:
+            raise serializers.ValidationError(
+                _("Products %s do not exist.") % ", ".join(sorted(str(pk) for pk in missing)))
+        return prices
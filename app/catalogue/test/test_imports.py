@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from nose.tools import eq_, ok_
+
+from ..imports import ProductImportError, import_products
+from ..models import Product
+from .factories import ProductClassFactory, ProductFactory
+
+
+class ImportProductsTestCase(TestCase):
+    """
+    Tests the bulk product import.
+    """
+
+    def setUp(self):
+        self.product_class = ProductClassFactory(slug='books')
+
+    def test_import(self):
+        created, updated = import_products([
+            {'title': 'Clean Code', 'price': '450', 'product_class': 'books'},
+            {'title': 'Refactoring', 'is_public': 'false', 'description': 'Improving the design'},
+        ], batch_size=1)
+        eq_((created, updated), (2, 0))
+        product = Product.objects.get(title='Clean Code')
+        eq_(product.slug, 'clean-code')
+        eq_(product.price, Decimal('450'))
+        eq_(product.product_class, self.product_class)
+        ok_(not Product.objects.get(title='Refactoring').is_public)
+        eq_(list(Product.objects.search('design')), [Product.objects.get(title='Refactoring')])
+
+    def test_reimport_updates(self):
+        product = ProductFactory()
+        created, updated = import_products([
+            {'id': product.pk, 'title': 'New title', 'price': '10'},
+            {'id': product.pk, 'title': 'Newer title', 'price': '20'},
+        ])
+        eq_((created, updated), (0, 1))
+        product = Product.objects.get(pk=product.pk)
+        eq_((product.title, product.price), ('Newer title', Decimal('20')))
+        eq_(list(Product.objects.search('newer')), [product])
+
+    def test_reimport_without_ids(self):
+        product = ProductFactory(slug='clean-code')
+        rows = [{'title': 'Clean Code', 'price': '450'}, {'title': 'Refactoring', 'price': '300'}]
+        eq_(import_products(rows), (1, 1))
+        eq_(import_products(rows), (0, 2))
+        eq_(Product.objects.count(), 2)
+        product.refresh_from_db()
+        eq_(product.price, Decimal('450'))
+
+    def test_ambiguous_slug(self):
+        ProductFactory(slug='clean-code')
+        ProductFactory(slug='clean-code')
+        with self.assertRaisesMessage(ProductImportError, "Row 1: several products have the slug 'clean-code'"):
+            import_products([{'title': 'Clean Code'}])
+
+    def test_too_long(self):
+        with self.assertRaisesMessage(ProductImportError, "Row 2: the title is longer than 255 characters"):
+            import_products([{'title': 'Clean Code'}, {'title': 'x' * 256}])
+        with self.assertRaisesMessage(ProductImportError, "Row 1: the currency is longer than 12 characters"):
+            import_products([{'title': 'Clean Code', 'currency': 'Indian rupees'}])
+        eq_(Product.objects.count(), 0)
+
+    def test_invalid_row(self):
+        with self.assertRaisesMessage(ProductImportError, "Row 2: unknown product class 'toys'"):
+            import_products([{'title': 'Clean Code'}, {'title': 'Lego', 'product_class': 'toys'}])
+        eq_(Product.objects.count(), 0)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'products.jsonl')
+            with open(path, 'w') as feed:
+                for n in range(3):
+                    feed.write(json.dumps({'title': f'Book {n}', 'price': 100, 'product_class': 'books'}) + '\n')
+            out = StringIO()
+            call_command('import_products', path, '--batch-size', '2', stdout=out)
+            ok_("3 created" in out.getvalue())
+            eq_(self.product_class.products.count(), 3)
+
+            with self.assertRaises(CommandError):
+                call_command('import_products', os.path.join(directory, 'products.xml'))
@@ -0,0 +1,77 @@
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from nose.tools import eq_
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ...cart.models import Basket
+from ...cart.test.factories import BasketFactory
+from ...users.test.factories import UserFactory
+from ..models import Product
+from ..pricing import reprice_products
+from .factories import ProductFactory
+
+
+class RepriceTestCase(APITestCase):
+    """
+    Tests the bulk repricing of products and basket lines.
+    """
+
+    def setUp(self):
+        self.product = ProductFactory(price=100)
+        self.other = ProductFactory(price=30)
+        self.baskets = {}
+        for basket_status in (Basket.OPEN, Basket.SAVED, Basket.FROZEN):
+            basket = BasketFactory(status=Basket.OPEN)
+            basket.add_product(self.product, 2)
+            basket.add_product(self.other, 1)
+            Basket.objects.filter(pk=basket.pk).update(status=basket_status)
+            self.baskets[basket_status] = basket
+        self.url = reverse('product-reprice')
+
+    def test_reprice(self):
+        eq_(reprice_products([(self.product.pk, Decimal('80'), None)]), (1, 2))
+        eq_(Product.objects.get(pk=self.product.pk).price, Decimal('80'))
+        for basket_status, total in ((Basket.OPEN, 190), (Basket.SAVED, 190), (Basket.FROZEN, 230)):
+            basket = Basket.objects.get(pk=self.baskets[basket_status].pk)
+            eq_(basket.total, Decimal(total))
+            eq_(basket.lines.get(product=self.product).price, Decimal(total - 30) / 2)
+
+    def test_reprice_currency(self):
+        reprice_products([(self.other.pk, Decimal('1'), 'USD')])
+        line = self.baskets[Basket.OPEN].lines.get(product=self.other)
+        eq_((line.price, line.currency), (Decimal('1'), 'USD'))
+        eq_(Product.objects.get(pk=self.product.pk).currency, 'INR')
+
+    def test_api_admin_only(self):
+        data = {"prices": [{"product": self.product.pk, "price": "80.00"}]}
+        self.client.force_authenticate(UserFactory())
+        response = self.client.post(self.url, data, format='json')
+        eq_(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(UserFactory(is_staff=True))
+        response = self.client.post(self.url, data, format='json')
+        eq_(response.status_code, status.HTTP_200_OK)
+        eq_(response.data, {"products": 1, "baskets": 2})
+
+    def test_api_unknown_product(self):
+        self.client.force_authenticate(UserFactory(is_staff=True))
+        data = {"prices": [{"product": "0b8d6b52-5b0a-4c1e-9d2c-6bfa6c6b62d4", "price": "80.00"}]}
+        response = self.client.post(self.url, data, format='json')
+        eq_(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        eq_(Product.objects.get(pk=self.product.pk).price, Decimal('100'))
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'prices.csv')
+            with open(path, 'w') as prices:
+                prices.write(f"product,price,currency\n{self.product.pk},50,\n{self.other.pk},10,INR\n")
+            out = StringIO()
+            call_command('reprice_products', path, stdout=out)
+        eq_(out.getvalue().strip(), "Repriced 2 products, 2 baskets updated.")
+        eq_(Basket.objects.get(pk=self.baskets[Basket.OPEN].pk).total, Decimal('110'))
@@ -0,0 +1,87 @@
+from django.urls import reverse
+from nose.tools import eq_, ok_
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ...users.test.factories import UserFactory
+from .factories import ProductFactory
+
+
+class ListProductsTestCase(APITestCase):
+    """
+    Tests /products list operation.
+    """
+
+    def setUp(self):
+        self.url = reverse('product-list')
+        self.products = [ProductFactory() for _ in range(5)]
+        self.private = ProductFactory(is_public=False)
+
+    def test_list_products_anonymous(self):
+        """
+        The catalogue is public and hides non public products.
+        """
+        response = self.client.get(self.url)
+        eq_(response.status_code, status.HTTP_200_OK)
+        ids = [product["id"] for product in response.data["results"]]
+        eq_(len(ids), 5)
+        ok_(str(self.private.id) not in ids)
+
+    def test_list_products_newest_first(self):
+        response = self.client.get(self.url)
+        created = [product["created"] for product in response.data["results"]]
+        eq_(created, sorted(created, reverse=True))
+
+    def test_list_products_cursor_pagination(self):
+        """
+        Following the `next` links walks the whole catalogue exactly once.
+        """
+        seen = []
+        url = self.url + '?page_size=2'
+        while url:
+            response = self.client.get(url)
+            eq_(response.status_code, status.HTTP_200_OK)
+            ok_("count" not in response.data)
+            seen += [product["id"] for product in response.data["results"]]
+            url = response.data["next"]
+        eq_(sorted(seen), sorted(str(product.id) for product in self.products))
+
+
+class SearchProductsTestCase(APITestCase):
+    """
+    Tests /products/search operation.
+    """
+
+    def setUp(self):
+        self.url = reverse('product-search')
+        self.shoes = ProductFactory(title='Running shoes', description='Light and fast')
+        self.socks = ProductFactory(title='Wool socks', description='Goes well with running shoes')
+        self.hidden = ProductFactory(title='Prototype shoes', is_public=False)
+        ProductFactory(title='Coffee mug')
+
+    def test_search_requires_query(self):
+        response = self.client.get(self.url)
+        eq_(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_ranks_title_matches_first(self):
+        response = self.client.get(self.url, {"q": "shoes"})
+        eq_(response.status_code, status.HTTP_200_OK)
+        ids = [product["id"] for product in response.data["results"]]
+        eq_(ids, [str(self.shoes.id), str(self.socks.id)])
+
+    def test_search_uses_stemming(self):
+        response = self.client.get(self.url, {"q": "runs"})
+        eq_(len(response.data["results"]), 2)
+
+    def test_search_sees_updated_title(self):
+        self.socks.title = 'Cotton gloves'
+        self.socks.description = ''
+        self.socks.save()
+        response = self.client.get(self.url, {"q": "gloves"})
+        eq_([product["id"] for product in response.data["results"]], [str(self.socks.id)])
+
+    def test_staff_search_includes_non_public_products(self):
+        staff = UserFactory(is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {staff.auth_token}')
+        response = self.client.get(self.url, {"q": "shoes"})
+        ok_(str(self.hidden.id) in [product["id"] for product in response.data["results"]])
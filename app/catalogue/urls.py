@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('', views.ProductList.as_view(), name='product-list'),
+    path('search/', views.ProductSearch.as_view(), name='product-search'),
+    path('prices/', views.ProductReprice.as_view(), name='product-reprice'),
+]
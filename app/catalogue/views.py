@@ -0,0 +1,69 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+
+from app.base.pagination import CreatedCursorPagination
+from app.catalogue.models import Product
+from app.catalogue.pricing import reprice_products
+from app.catalogue.serializers import ProductSerializer, RepriceSerializer
+
+
+class ProductList(generics.ListAPIView):
+    """
+    GET: List the public products, newest first.
+    Paginated with an opaque `cursor` query parameter, see the `next` and
+    `previous` links of the response.
+    """
+    permission_classes = (AllowAny,)
+    serializer_class = ProductSerializer
+    pagination_class = CreatedCursorPagination
+
+    def get_queryset(self):
+        return Product.objects.public().defer('search_vector')
+
+
+class ProductSearch(generics.ListAPIView):
+    """
+    GET: Full text search over product titles and descriptions.
+    GET(url?q=blue+shoes)
+    Results are ranked, title matches first. Staff users also see products
+    that are not public.
+    """
+    permission_classes = (AllowAny,)
+    serializer_class = ProductSerializer
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': _('This query parameter is required.')})
+
+        qs = Product.objects.all()
+        if not self.request.user.is_staff:
+            qs = qs.public()
+        return qs.search(query).defer('search_vector')
+
+
+class ProductReprice(generics.GenericAPIView):
+    """
+    POST: Set the prices of many products at once, admin only.
+    The lines of open and saved baskets follow the new prices.
+    POST(url, prices)
+    {
+        "prices": [
+            {"product": "id", "price": "450.00"},
+            {"product": "id", "price": "9.99", "currency": "USD"}
+        ]
+    }
+    """
+    permission_classes = (IsAdminUser,)
+    serializer_class = RepriceSerializer
+
+    def post(self, request, *args, **kwargs):  # pylint: disable=redefined-builtin
+        ser = self.get_serializer(data=request.data)
+        if not ser.is_valid():
+            return Response({"reason": ser.errors}, status=status.HTTP_406_NOT_ACCEPTABLE)
+        products, baskets = reprice_products(
+            (price["product"], price["price"], price["currency"]) for price in ser.validated_data["prices"])
+        return Response({"products": products, "baskets": baskets})
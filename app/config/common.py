@@ -15,6 +15,7 @@ class Common(Configuration):
         'django.contrib.sessions',
         'django.contrib.messages',
         'django.contrib.staticfiles',
+        'django.contrib.postgres',
 
 
         # Third party apps
@@ -24,23 +25,30 @@ class Common(Configuration):
         'drf_yasg',
 
         # Your apps
+        'app.base',
         'app.catalogue',
         'app.cart',
         'app.order',
+        'app.monitoring.apps.MonitoringConfig',
+        'app.reporting',
         'app.users',
 
     )
 
     # https://docs.djangoproject.com/en/2.0/topics/http/middleware/
+    # Sessions, CSRF, auth and messages are skipped for token authenticated
+    # requests to the API, see app.base.middleware.
     MIDDLEWARE = (
+        'app.monitoring.middleware.RequestMetricsMiddleware',
         'django.middleware.security.SecurityMiddleware',
-        'django.contrib.sessions.middleware.SessionMiddleware',
+        'app.base.middleware.SessionMiddleware',
         'django.middleware.common.CommonMiddleware',
-        'django.middleware.csrf.CsrfViewMiddleware',
-        'django.contrib.auth.middleware.AuthenticationMiddleware',
-        'django.contrib.messages.middleware.MessageMiddleware',
+        'app.base.middleware.CsrfViewMiddleware',
+        'app.base.middleware.AuthenticationMiddleware',
+        'app.base.middleware.MessageMiddleware',
         'django.middleware.clickjacking.XFrameOptionsMiddleware',
     )
+    API_PATH_PREFIX = '/api/'
 
     ALLOWED_HOSTS = ["*"]
     ROOT_URLCONF = 'app.urls'
@@ -62,6 +70,59 @@ class Common(Configuration):
         )
     }
 
+    # Cache
+    # https://docs.djangoproject.com/en/3.0/topics/cache/
+    CACHES = {
+        'default': {
+            'BACKEND': os.getenv('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+            'LOCATION': os.getenv('DJANGO_CACHE_LOCATION', ''),
+        }
+    }
+
+    # Cart
+    # Seconds the id of a user's open basket stays cached.
+    OPEN_BASKET_CACHE_TIMEOUT = int(os.getenv('OPEN_BASKET_CACHE_TIMEOUT', 60 * 60))
+
+    # Order
+    # Seconds an Idempotency-Key of an order creation is remembered.
+    IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', 24 * 60 * 60))
+    # Seconds after which a key reserved by a request that never finished can
+    # be reused, at least the request timeout.
+    IDEMPOTENCY_KEY_LEASE = int(os.getenv('IDEMPOTENCY_KEY_LEASE', 30))
+
+    # Authentication
+    # Seconds an authenticated API token is trusted without checking it in
+    # the database, 0 disables the cache. A revoked token can be accepted by
+    # other processes for that long.
+    TOKEN_CACHE_TTL = int(os.getenv('TOKEN_CACHE_TTL', 60))
+    # Tokens kept per process.
+    TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+    # Also share the cached tokens between processes through `CACHES`.
+    TOKEN_CACHE_SHARED = strtobool(os.getenv('TOKEN_CACHE_SHARED', 'no'))
+
+    # OpenAPI schema
+    # Written by `manage.py generate_openapi_schema` and served by the schema
+    # views, unless OPENAPI_SCHEMA_RUNTIME generates it on every request.
+    OPENAPI_SCHEMA_PATH = os.getenv('OPENAPI_SCHEMA_PATH', join(os.path.dirname(BASE_DIR), 'openapi.json'))
+    OPENAPI_SCHEMA_RUNTIME = strtobool(os.getenv('OPENAPI_SCHEMA_RUNTIME', 'no'))
+
+    # Monitoring
+    # Addresses allowed to read /metrics, comma separated, `*` for all.
+    METRICS_ALLOWED_IPS = os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1').split(',')
+    # Queries of requests slower than this many milliseconds are sampled,
+    # with their plan, to the slow query log (admin and `manage.py
+    # slow_queries`). 0 disables it.
+    SLOW_QUERY_THRESHOLD = int(os.getenv('SLOW_QUERY_THRESHOLD', 200))
+    # Share of the slow queries recorded.
+    SLOW_QUERY_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_SAMPLE_RATE', 1))
+    # Number of slow queries kept, the oldest ones are overwritten.
+    SLOW_QUERY_LOG_SIZE = int(os.getenv('SLOW_QUERY_LOG_SIZE', 1000))
+
+    # Reporting
+    # Seconds the sales rollups stay behind the orders, so that orders of
+    # transactions still in flight are not skipped by the watermark.
+    SALES_ROLLUP_LAG = int(os.getenv('SALES_ROLLUP_LAG', 60))
+
     # General
     APPEND_SLASH = True
     TIME_ZONE = 'UTC'
@@ -200,6 +261,6 @@ class Common(Configuration):
         ],
         'DEFAULT_AUTHENTICATION_CLASSES': (
             'rest_framework.authentication.SessionAuthentication',
-            'rest_framework.authentication.TokenAuthentication',
+            'app.users.authentication.CachedTokenAuthentication',
         ),
     }
@@ -5,6 +5,8 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 class Local(Common):
     DEBUG = True
+    # Keep the API documentation in sync with the code while developing.
+    OPENAPI_SCHEMA_RUNTIME = True
 
     # Testing
     INSTALLED_APPS = Common.INSTALLED_APPS
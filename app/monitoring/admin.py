@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from app.monitoring.models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    date_hierarchy = 'recorded'
+    list_display = ('recorded', 'duration', 'frame', 'path', 'sql')
+    search_fields = ('sql', 'frame', 'path')
+    readonly_fields = ('slot', 'recorded', 'duration', 'sql', 'frame', 'path', 'plan')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from rest_framework import serializers
+
+from app.monitoring.timing import timed
+
+
+class MonitoringConfig(AppConfig):
+    name = 'app.monitoring'
+
+    def ready(self):
+        # Time the serialization of every response of the API.
+        data = serializers.BaseSerializer.data
+        serializers.BaseSerializer.data = property(timed('serialize')(data.fget))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from app.monitoring.models import SlowQuery
+
+
+class Command(BaseCommand):
+    help = "Show the slowest recently recorded queries, with their plans."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10, help="Number of queries to show.")
+        parser.add_argument('--no-plan', action='store_true', help="Leave the query plans out.")
+        parser.add_argument('--clear', action='store_true', help="Empty the slow query log.")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            SlowQuery.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS("Cleared the slow query log."))
+            return
+
+        for query in SlowQuery.objects.order_by('-duration')[:options['limit']]:
+            self.stdout.write(self.style.WARNING(
+                f"{query.duration:.1f}ms at {query.recorded:%Y-%m-%d %H:%M:%S} {query.path} {query.frame}"))
+            self.stdout.write(query.sql)
+            if query.plan and not options['no_plan']:
+                self.stdout.write(query.plan)
+            self.stdout.write('')
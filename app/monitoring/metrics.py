@@ -0,0 +1,45 @@
+"""
+Prometheus metrics of the requests.
+
+With several gunicorn workers, set the `prometheus_multiproc_dir`
+environment variable to an empty directory shared by the workers: each
+worker then writes its samples there and `/metrics` aggregates them (see
+gunicorn.conf.py).
+"""
+import os
+
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Histogram, generate_latest,
+                               multiprocess)
+
+LABELS = ('route', 'method', 'status')
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, float('inf'))
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', "Time spent handling the request.", LABELS)
+DB_DURATION = Histogram(
+    'http_request_db_duration_seconds', "Time spent in database queries.", LABELS)
+DB_QUERIES = Histogram(
+    'http_request_db_queries', "Number of database queries.", LABELS, buckets=QUERY_BUCKETS)
+SERIALIZE_DURATION = Histogram(
+    'http_request_serialize_duration_seconds', "Time spent serializing the response data.", LABELS)
+
+
+def observe(route, method, status, total, timings):
+    labels = (route, method, status)
+    REQUEST_DURATION.labels(*labels).observe(total)
+    DB_DURATION.labels(*labels).observe(timings.durations['db'])
+    DB_QUERIES.labels(*labels).observe(timings.counts['db'])
+    SERIALIZE_DURATION.labels(*labels).observe(timings.durations['serialize'])
+
+
+def export():
+    """
+    The metrics in the Prometheus text format, and their content type.
+    """
+    if 'prometheus_multiproc_dir' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
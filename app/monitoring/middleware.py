@@ -0,0 +1,42 @@
+from time import perf_counter
+
+from django.db import connection
+
+from app.monitoring import metrics, timing
+from app.monitoring.slow_queries import SlowQueryRecorder
+
+
+class RequestMetricsMiddleware:
+    """
+    Times the request, its database queries and the serialization of its
+    data. The timings are sent back in a `Server-Timing` header and recorded
+    in the Prometheus histograms of the route. Slow queries are sampled to
+    the slow query log. Should come first in `MIDDLEWARE` to time the other
+    middleware too.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = timing.start()
+        recorder = SlowQueryRecorder(request.path)
+        start_time = perf_counter()
+        try:
+            with connection.execute_wrapper(recorder), connection.execute_wrapper(timing.QueryTimer(timings)):
+                response = self.get_response(request)
+        finally:
+            timing.stop()
+        total = perf_counter() - start_time
+        # Outside of the request's transactions, whether they committed or not.
+        recorder.flush(connection)
+
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={timings.durations["db"] * 1000:.1f};desc="{timings.counts["db"]} queries"',
+            f'serialize;dur={timings.durations["serialize"] * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ))
+        match = request.resolver_match
+        route = match.route if match is not None else 'unmatched'
+        metrics.observe(route, request.method, response.status_code, total, timings)
+        return response
@@ -0,0 +1,37 @@
+# Generated by Django 3.0.8 on 2026-10-18 12:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slot', models.PositiveIntegerField(unique=True, verbose_name='Slot')),
+                ('recorded', models.DateTimeField(db_index=True, verbose_name='Recorded')),
+                ('duration', models.FloatField(verbose_name='Duration (ms)')),
+                ('sql', models.TextField(verbose_name='Normalized SQL')),
+                ('frame', models.CharField(blank=True, max_length=255, verbose_name='Called from')),
+                ('path', models.CharField(blank=True, max_length=255, verbose_name='Request path')),
+                ('plan', models.TextField(blank=True, verbose_name='Query plan')),
+            ],
+            options={
+                'verbose_name': 'Slow query',
+                'verbose_name_plural': 'Slow queries',
+                'ordering': ['-recorded'],
+            },
+        ),
+        # Hands out the ring buffer slots, see app.monitoring.slow_queries.
+        migrations.RunSQL(
+            "CREATE SEQUENCE monitoring_slowquery_slot_seq",
+            "DROP SEQUENCE monitoring_slowquery_slot_seq",
+        ),
+    ]
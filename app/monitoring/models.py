@@ -0,0 +1,24 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class SlowQuery(models.Model):
+    """
+    A sampled slow query. The table is a ring buffer of
+    `SLOW_QUERY_LOG_SIZE` slots: new queries overwrite the oldest ones.
+    """
+    slot = models.PositiveIntegerField(_("Slot"), unique=True)
+    recorded = models.DateTimeField(_("Recorded"), db_index=True)
+    duration = models.FloatField(_("Duration (ms)"))
+    sql = models.TextField(_("Normalized SQL"))
+    frame = models.CharField(_("Called from"), max_length=255, blank=True)
+    path = models.CharField(_("Request path"), max_length=255, blank=True)
+    plan = models.TextField(_("Query plan"), blank=True)
+
+    class Meta:
+        ordering = ['-recorded']
+        verbose_name = _("Slow query")
+        verbose_name_plural = _("Slow queries")
+
+    def __str__(self):
+        return f'{self.duration:.0f}ms {self.sql[:80]}'
@@ -0,0 +1,127 @@
+"""
+Sampling of slow queries into the `SlowQuery` ring buffer.
+"""
+import logging
+import os
+import random
+import re
+import threading
+import traceback
+from time import perf_counter
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils.timezone import now
+
+logger = logging.getLogger(__name__)
+
+# Writes a query to the next slot of the ring buffer, the slots being
+# handed out by a sequence so that concurrent writers never collide.
+RECORD_SQL = """
+INSERT INTO monitoring_slowquery (slot, recorded, duration, sql, frame, path, plan)
+VALUES (nextval('monitoring_slowquery_slot_seq') %% %(size)s, %(recorded)s, %(duration)s, %(sql)s, %(frame)s,
+        %(path)s, %(plan)s)
+ON CONFLICT (slot) DO UPDATE SET
+recorded = EXCLUDED.recorded, duration = EXCLUDED.duration, sql = EXCLUDED.sql, frame = EXCLUDED.frame,
+path = EXCLUDED.path, plan = EXCLUDED.plan
+"""
+EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MONITORING_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_recording = threading.local()
+
+
+def recording():
+    """
+    Whether the queries run now record a slow query, not the request's.
+    """
+    return getattr(_recording, 'active', False)
+
+
+def normalize(sql):
+    """
+    The shape of a query: literals replaced by `?`, lists of parameters
+    collapsed and whitespace squeezed, so that its occurrences look alike.
+    """
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+    sql = re.sub(r'%s', '?', sql)
+    sql = re.sub(r'\(\s*\?(?:\s*,\s*\?)+\s*\)', '(...)', sql)
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def calling_frame():
+    """
+    The innermost frame of the project code that ran the query, e.g. a
+    view or a serializer method.
+    """
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(APP_DIR) and not frame.filename.startswith(MONITORING_DIR):
+            return f'{os.path.relpath(frame.filename, os.path.dirname(APP_DIR))}:{frame.lineno} in {frame.name}'
+    return ''
+
+
+class SlowQueryRecorder:
+    """
+    Database execute wrapper sampling the queries slower than
+    `SLOW_QUERY_THRESHOLD` milliseconds. The samples are written by `flush`
+    once the request is over: the queries of a request that rolls back are
+    kept, and the request's locks are released before the plans are
+    explained and the samples written.
+    """
+
+    def __init__(self, path=''):
+        self.path = path[:255]
+        self.samples = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if recording():
+            return execute(sql, params, many, context)
+        start_time = perf_counter()
+        result = execute(sql, params, many, context)
+        duration = (perf_counter() - start_time) * 1000
+        threshold = settings.SLOW_QUERY_THRESHOLD
+        if threshold and duration >= threshold and random.random() < settings.SLOW_QUERY_SAMPLE_RATE:
+            explainable = not many and sql.lstrip().upper().startswith(EXPLAINABLE)
+            self.samples.append((sql, params if explainable else None, explainable, duration, calling_frame()))
+        return result
+
+    def flush(self, connection):
+        """
+        Write the samples taken so far to the ring buffer, with their plan on
+        PostgreSQL.
+        """
+        samples, self.samples = self.samples, []
+        if not samples or connection.needs_rollback:
+            return
+        _recording.active = True
+        try:
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                for sql, params, explainable, duration, frame in samples:
+                    plan = ''
+                    if explainable and connection.vendor == 'postgresql':
+                        plan = self.explain(cursor, sql, params)
+                    cursor.execute(RECORD_SQL, {
+                        'size': settings.SLOW_QUERY_LOG_SIZE,
+                        'recorded': now(),
+                        'duration': duration,
+                        'sql': normalize(sql),
+                        'frame': frame[:255],
+                        'path': self.path,
+                        'plan': plan,
+                    })
+        except DatabaseError:
+            logger.warning("Could not record the slow queries.", exc_info=True)
+        finally:
+            _recording.active = False
+
+    @staticmethod
+    def explain(cursor, sql, params):
+        # Tables created and dropped by the request can no longer be planned.
+        try:
+            with transaction.atomic(using=cursor.db.alias):
+                cursor.execute(f'EXPLAIN {sql}', params)
+                return '\n'.join(line for (line,) in cursor.fetchall())
+        except DatabaseError:
+            return ''
@@ -0,0 +1,38 @@
+from django.test import override_settings
+from django.urls import reverse
+from nose.tools import eq_, ok_
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ...users.test.factories import UserFactory
+
+
+class RequestMetricsTestCase(APITestCase):
+    """
+    Tests the request timings and the /metrics endpoint.
+    """
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+
+    def test_server_timing(self):
+        response = self.client.get(reverse('order-list-create'))
+        eq_(response.status_code, status.HTTP_200_OK)
+        timings = dict(
+            (entry.split(';')[0], entry) for entry in response['Server-Timing'].split(', '))
+        eq_(sorted(timings), ['db', 'serialize', 'total'])
+        ok_('queries"' in timings['db'])
+        ok_(not timings['db'].endswith('desc="0 queries"'))
+
+    def test_metrics(self):
+        self.client.get(reverse('basket'))
+        response = self.client.get(reverse('metrics'))
+        eq_(response.status_code, status.HTTP_200_OK)
+        content = response.content.decode()
+        ok_('http_request_duration_seconds_count{method="GET",route="api/v1/cart/",status="200"}' in content)
+        ok_('http_request_db_queries_bucket' in content)
+
+    @override_settings(METRICS_ALLOWED_IPS=['10.0.0.1'])
+    def test_metrics_forbidden(self):
+        eq_(self.client.get(reverse('metrics')).status_code, status.HTTP_403_FORBIDDEN)
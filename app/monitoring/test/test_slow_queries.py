@@ -0,0 +1,71 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from nose.tools import eq_, ok_
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ...cart.test.factories import BasketFactory
+from ...catalogue.test.factories import ProductFactory
+from ...users.test.factories import UserFactory
+from ..models import SlowQuery
+from ..slow_queries import normalize
+
+
+class NormalizeTestCase(APITestCase):
+
+    def test_normalize(self):
+        eq_(
+            normalize("SELECT  \"id\" FROM t0 WHERE a IN (%s, %s, %s) AND b = 'x''y' AND c > 10\n LIMIT 21"),
+            'SELECT "id" FROM t0 WHERE a IN (...) AND b = ? AND c > ? LIMIT ?',
+        )
+
+
+@override_settings(SLOW_QUERY_THRESHOLD=0.000001, SLOW_QUERY_SAMPLE_RATE=1, SLOW_QUERY_LOG_SIZE=3)
+class SlowQueryLogTestCase(APITestCase):
+    """
+    Tests the sampling of slow queries.
+    """
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+
+    def test_records_slow_queries(self):
+        response = self.client.get(reverse('basket'))
+        eq_(response.status_code, status.HTTP_200_OK)
+        # The ring buffer keeps the last 3 queries only.
+        eq_(SlowQuery.objects.count(), 3)
+        query = SlowQuery.objects.filter(sql__startswith='SELECT').first()
+        ok_(query is not None)
+        eq_(query.path, '/api/v1/cart/')
+        ok_(query.frame.startswith('app/'))
+        ok_('Scan' in query.plan)
+
+    @override_settings(SLOW_QUERY_LOG_SIZE=100)
+    def test_records_queries_of_rolled_back_requests(self):
+        basket = BasketFactory(user=self.user)
+        basket.add_product(ProductFactory())
+        # The wrong total makes `place_order` roll back its transaction.
+        response = self.client.post(reverse('order-list-create'), {"basket": basket.pk, "total": 1})
+        eq_(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        ok_(SlowQuery.objects.filter(sql__contains='FOR UPDATE').exists())
+
+    def test_query_count_is_unchanged(self):
+        # Authenticate first so that both requests find the token cached.
+        self.client.get(reverse('order-list-create'))
+        response = self.client.get(reverse('order-list-create'))
+        timings = response['Server-Timing']
+        with override_settings(SLOW_QUERY_THRESHOLD=0):
+            response = self.client.get(reverse('order-list-create'))
+        eq_(response['Server-Timing'].split(';')[2], timings.split(';')[2])
+
+    def test_command(self):
+        self.client.get(reverse('basket'))
+        out = StringIO()
+        call_command('slow_queries', '--limit', '1', stdout=out)
+        ok_('ms at' in out.getvalue())
+        call_command('slow_queries', '--clear', stdout=out)
+        eq_(SlowQuery.objects.count(), 0)
@@ -0,0 +1,77 @@
+"""
+Timings of the request being handled, collected per thread.
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+
+from app.monitoring import slow_queries
+
+_state = threading.local()
+
+
+class RequestTimings:
+    """
+    Durations (in seconds) and counts of the timed operations of a request.
+    """
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.active = set()
+
+    def record(self, name, duration):
+        self.durations[name] += duration
+        self.counts[name] += 1
+
+
+def start():
+    _state.timings = RequestTimings()
+    return _state.timings
+
+
+def stop():
+    _state.timings = None
+
+
+def current():
+    return getattr(_state, 'timings', None)
+
+
+@contextmanager
+def timed(name):
+    """
+    Add the time spent in the block, or decorated function, to the `name`
+    timing of the current request. Nested blocks of the same name are only
+    counted once.
+    """
+    timings = current()
+    if timings is None or name in timings.active:
+        yield
+        return
+    timings.active.add(name)
+    start_time = perf_counter()
+    try:
+        yield
+    finally:
+        timings.active.discard(name)
+        timings.record(name, perf_counter() - start_time)
+
+
+class QueryTimer:
+    """
+    Database execute wrapper adding the queries to the `db` timing.
+    """
+
+    def __init__(self, timings):
+        self.timings = timings
+
+    def __call__(self, execute, sql, params, many, context):
+        if slow_queries.recording():
+            return execute(sql, params, many, context)
+        start_time = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.timings.record('db', perf_counter() - start_time)
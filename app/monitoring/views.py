@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from app.monitoring import metrics
+
+
+def export_metrics(request):
+    """
+    Prometheus metrics, for the addresses of `METRICS_ALLOWED_IPS` only.
+    """
+    allowed = settings.METRICS_ALLOWED_IPS
+    if '*' not in allowed and request.META.get('REMOTE_ADDR') not in allowed:
+        return HttpResponseForbidden()
+    content, content_type = metrics.export()
+    return HttpResponse(content, content_type=content_type)
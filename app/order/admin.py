@@ -1,6 +1,31 @@
 from django.contrib import admin
+from django.http import StreamingHttpResponse
 
-from app.order.models import Order
+from app.order import export
+from app.order.models import Order, OrderLine
+
+
+def export_action(fmt, include_lines):
+    """
+    Admin action streaming the selected orders as an export file.
+    """
+    def action(modeladmin, request, queryset):
+        response = StreamingHttpResponse(
+            export.iter_export(queryset, fmt, include_lines),
+            content_type=export.CONTENT_TYPES[fmt],
+        )
+        response['Content-Disposition'] = f'attachment; filename="orders.{fmt}"'
+        return response
+
+    action.__name__ = f'export_{fmt}{"_with_lines" if include_lines else ""}'
+    action.short_description = f'Export selected orders as {fmt.upper()}{" with lines" if include_lines else ""}'
+    return action
+
+
+class OrderLineInline(admin.TabularInline):
+    model = OrderLine
+    readonly_fields = ('product', 'title', 'quantity', 'price', 'currency')
+    raw_id_fields = ('product',)
 
 
 @admin.register(Order)
@@ -8,3 +33,8 @@ class OrderAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'status', 'created', 'currency', 'total')
     readonly_fields = ('user', 'created')
     raw_id_fields = ('user',)
+    inlines = [OrderLineInline]
+    actions = [
+        export_action(fmt, include_lines)
+        for fmt in export.FORMATS for include_lines in (False, True)
+    ]
@@ -0,0 +1,87 @@
+"""
+Streaming export of orders as NDJSON or CSV.
+
+Orders and their lines are read with server side cursors (`iterator()`)
+and merged in order id order, so memory stays flat whatever the number of
+rows and the first bytes are produced right away.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from app.order.models import OrderLine
+
+NDJSON, CSV = ('ndjson', 'csv')
+FORMATS = (NDJSON, CSV)
+CONTENT_TYPES = {
+    NDJSON: 'application/x-ndjson',
+    CSV: 'text/csv',
+}
+ORDER_FIELDS = ('id', 'user_id', 'basket_id', 'status', 'currency', 'total', 'created')
+LINE_FIELDS = ('product_id', 'title', 'quantity', 'currency', 'price')
+CHUNK_SIZE = 2000
+
+
+class Echo:
+    """
+    A file-like object that returns what is written to it, to stream the
+    output of `csv.writer`.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_orders(queryset, include_lines=False, chunk_size=CHUNK_SIZE):
+    """
+    Yield the orders of the queryset as dicts, in id order, each with its
+    list of `lines` if `include_lines` is set.
+    """
+    orders = queryset.order_by('pk').values(*ORDER_FIELDS).iterator(chunk_size=chunk_size)
+    if not include_lines:
+        yield from orders
+        return
+
+    lines = OrderLine.objects.filter(
+        order__in=queryset.values('pk')
+    ).order_by('order_id', 'pk').values('order_id', *LINE_FIELDS).iterator(chunk_size=chunk_size)
+    line = next(lines, None)
+    for order in orders:
+        order['lines'] = []
+        while line is not None and line['order_id'] <= order['id']:
+            if line['order_id'] == order['id']:
+                order['lines'].append({field: line[field] for field in LINE_FIELDS})
+            line = next(lines, None)
+        yield order
+
+
+def iter_ndjson(queryset, include_lines=False, chunk_size=CHUNK_SIZE):
+    """
+    Yield one JSON document per order.
+    """
+    for order in iter_orders(queryset, include_lines, chunk_size):
+        yield json.dumps(order, cls=DjangoJSONEncoder) + '\n'
+
+
+def iter_csv(queryset, include_lines=False, chunk_size=CHUNK_SIZE):
+    """
+    Yield CSV rows, one per order or, with `include_lines`, one per order
+    line prefixed with the order columns.
+    """
+    writer = csv.writer(Echo())
+    line_columns = [f'line_{field}' for field in LINE_FIELDS] if include_lines else []
+    yield writer.writerow(list(ORDER_FIELDS) + line_columns)
+    for order in iter_orders(queryset, include_lines, chunk_size):
+        row = [order[field] for field in ORDER_FIELDS]
+        if not include_lines:
+            yield writer.writerow(row)
+            continue
+        for line in order['lines'] or [{}]:
+            yield writer.writerow(row + [line.get(field) for field in LINE_FIELDS])
+
+
+def iter_export(queryset, fmt=NDJSON, include_lines=False, chunk_size=CHUNK_SIZE):
+    if fmt == CSV:
+        return iter_csv(queryset, include_lines, chunk_size)
+    return iter_ndjson(queryset, include_lines, chunk_size)
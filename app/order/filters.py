@@ -0,0 +1,16 @@
+import django_filters
+
+from app.order.models import Order
+
+
+class OrderFilter(django_filters.FilterSet):
+    """
+    Filters of the order history, all served by the (user, status, created)
+    and (user, created) indexes.
+    """
+    created_after = django_filters.IsoDateTimeFilter(field_name='created', lookup_expr='gte')
+    created_before = django_filters.IsoDateTimeFilter(field_name='created', lookup_expr='lt')
+
+    class Meta:
+        model = Order
+        fields = ('status',)
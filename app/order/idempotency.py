@@ -0,0 +1,117 @@
+"""
+Idempotency keys for order creation.
+
+Clients send an `Idempotency-Key` header with `POST /orders/`. The first
+request with a key reserves it, and its 201 response is stored in the
+`IdempotencyKey` table and the cache. Retries with the same key get the
+stored response back without running the checkout again. The key is bound to
+a fingerprint of the request body, so reusing it for another request is an
+error. A reservation left behind by a request that never finished is taken
+over once it is older than `IDEMPOTENCY_KEY_LEASE` seconds.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+
+from app.order.models import IdempotencyKey
+
+HEADER = 'HTTP_IDEMPOTENCY_KEY'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = IdempotencyKey._meta.get_field('key').max_length
+
+
+class KeyInUse(Exception):
+    """
+    Another request with the same key is still being processed.
+    """
+
+
+class KeyReused(Exception):
+    """
+    The key was already used with a different request body.
+    """
+
+
+def fingerprint(data):
+    """
+    Hash of a request body, form data or parsed JSON.
+    """
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    return hashlib.sha256(json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder).encode()).hexdigest()
+
+
+def _cache_key(user, key):
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f'order:idempotency:{user.pk}:{digest}'
+
+
+def _expired_before():
+    return now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+
+
+def get_or_reserve(user, key, request_fingerprint=''):
+    """
+    Return the stored response of a key as a `(status_code, data)` tuple, or
+    `None` after reserving the key for the current request.
+    Raises `KeyReused` if the key was sent with another request body and
+    `KeyInUse` if another request holds the key.
+    """
+    stored = cache.get(_cache_key(user, key))
+    if stored is not None:
+        stored_fingerprint, status_code, data = stored
+        if stored_fingerprint != request_fingerprint:
+            raise KeyReused(key)
+        return status_code, data
+
+    keys = IdempotencyKey.objects.filter(user=user, key=key)
+    lease_expired_before = now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_LEASE)
+    (keys.filter(created__lt=_expired_before()) | keys.filter(
+        status_code__isnull=True, created__lt=lease_expired_before)).delete()
+    try:
+        with transaction.atomic():
+            IdempotencyKey.objects.create(user=user, key=key, fingerprint=request_fingerprint)
+        return None
+    except IntegrityError:
+        pass
+
+    record = keys.first()
+    if record is not None and record.fingerprint != request_fingerprint:
+        raise KeyReused(key)
+    if record is None or record.status_code is None:
+        raise KeyInUse(key)
+    cache.set(
+        _cache_key(user, key), (record.fingerprint, record.status_code, record.response),
+        settings.IDEMPOTENCY_KEY_TTL)
+    return record.status_code, record.response
+
+
+def store(user, key, status_code, data, request_fingerprint=''):
+    """
+    Store the response of the request that reserved the key.
+    """
+    # Store what the client got: the JSON rendering of the response data.
+    data = json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+    IdempotencyKey.objects.filter(user=user, key=key).update(status_code=status_code, response=data)
+    cache.set(_cache_key(user, key), (request_fingerprint, status_code, data), settings.IDEMPOTENCY_KEY_TTL)
+
+
+def release(user, key):
+    """
+    Free a reserved key without storing a response, so it can be retried.
+    """
+    IdempotencyKey.objects.filter(user=user, key=key, status_code__isnull=True).delete()
+
+
+def purge_expired():
+    """
+    Delete the keys older than `IDEMPOTENCY_KEY_TTL`.
+    """
+    deleted, __ = IdempotencyKey.objects.filter(created__lt=_expired_before()).delete()
+    return deleted
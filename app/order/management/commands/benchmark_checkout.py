@@ -0,0 +1,90 @@
+import queue
+import random
+import statistics
+import threading
+import uuid
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from app.cart.models import Basket, Line
+from app.catalogue.models import Product
+from app.order.operations import place_order
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure checkout throughput with concurrent workers. A throwaway set of "
+        "users, products and baskets is created and deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--baskets', type=int, default=200, help="Number of baskets to check out.")
+        parser.add_argument('--lines', type=int, default=5, help="Number of lines per basket.")
+        parser.add_argument('--workers', type=int, default=8, help="Number of concurrent workers.")
+        parser.add_argument(
+            '--attempts', type=int, default=1,
+            help="Checkouts attempted per basket, more than one measures contention on the basket lock.")
+
+    def handle(self, *args, **options):
+        prefix = f'checkout-bench-{uuid.uuid4().hex[:8]}'
+        users = User.objects.bulk_create(
+            User(username=f'{prefix}-{i}') for i in range(options['baskets']))
+        products = Product.objects.bulk_create(
+            Product(title=f'{prefix}-{i}', slug=f'{prefix}-{i}', price=random.randint(1, 1000))
+            for i in range(options['lines']))
+        try:
+            baskets = Basket.objects.bulk_create(Basket(user=user) for user in users)
+            Line.objects.bulk_create(
+                Line(basket=basket, product=product, price=product.price, quantity=random.randint(1, 5))
+                for basket in baskets for product in products)
+            Basket.objects.filter(pk__in=[basket.pk for basket in baskets]).recalculate_totals()
+
+            tasks = [(basket.user, basket.pk) for basket in baskets] * options['attempts']
+            random.shuffle(tasks)
+            self.run(tasks, options['workers'])
+        finally:
+            User.objects.filter(username__startswith=prefix).delete()
+            Product.objects.filter(pk__in=[product.pk for product in products]).delete()
+
+    def run(self, tasks, workers):
+        pending = queue.Queue()
+        for task in tasks:
+            pending.put(task)
+        latencies, rejected = [], []
+
+        def work():
+            try:
+                while True:
+                    try:
+                        user, basket_id = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    start = perf_counter()
+                    try:
+                        place_order(user, basket_id)
+                    except ValueError:
+                        rejected.append(basket_id)
+                    latencies.append(perf_counter() - start)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work) for _ in range(workers)]
+        start = perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = perf_counter() - start
+
+        placed = len(latencies) - len(rejected)
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        self.stdout.write(
+            f"{len(tasks)} checkouts with {workers} workers in {elapsed:.2f}s: "
+            f"{placed} placed, {len(rejected)} rejected, {placed / elapsed:.1f} orders/s")
+        self.stdout.write(
+            f"latency p50 {cuts[49] * 1000:.1f}ms, p95 {cuts[94] * 1000:.1f}ms, p99 {cuts[98] * 1000:.1f}ms")
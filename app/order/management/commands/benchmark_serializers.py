@@ -0,0 +1,81 @@
+import uuid
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from app.cart.models import Basket, Line
+from app.cart.serializers import BasketSerializer, BasketValuesSerializer
+from app.catalogue.models import Product
+from app.order.models import Order, OrderLine
+from app.order.serializers import OrderSerializer, OrderValuesSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the time per row of the model serializers and of the values() serializers used by the basket "
+        "and order list endpoints, queries included. A throwaway user with a basket and orders is created and "
+        "deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, default=200, help="Number of lines of the basket and of each order.")
+        parser.add_argument('--orders', type=int, default=100, help="Number of orders.")
+        parser.add_argument('--repeat', type=int, default=20, help="Number of runs of each serializer.")
+
+    def handle(self, *args, **options):
+        prefix = f'serializer-bench-{uuid.uuid4().hex[:8]}'
+        user = User.objects.create(username=prefix)
+        products = Product.objects.bulk_create(
+            Product(title=f'{prefix}-{i}', slug=f'{prefix}-{i}', price=i + 1) for i in range(options['lines']))
+        try:
+            basket = Basket.objects.create(user=user)
+            Line.objects.bulk_create(
+                Line(basket=basket, product=product, price=product.price, quantity=2) for product in products)
+            Basket.objects.filter(pk=basket.pk).recalculate_totals()
+            orders = Order.objects.bulk_create(
+                Order(user=user, total=100) for _ in range(options['orders']))
+            OrderLine.objects.bulk_create(
+                OrderLine(order=order, product=product, title=product.title, quantity=2, price=product.price)
+                for order in orders for product in products)
+
+            basket = Basket.objects.get(pk=basket.pk)
+            orders = Order.objects.filter(user=user)
+            order_values_serializer = OrderValuesSerializer(include_lines=True)
+            basket_values_serializer = BasketValuesSerializer()
+
+            def serialize_basket():
+                # Read the lines on every run, like the values serializer does.
+                basket.__dict__.pop('_prefetched_objects_cache', None)
+                return BasketSerializer(BasketSerializer.setup_eager_loading([basket])[0]).data
+
+            self.compare(
+                "basket", options['lines'], options['repeat'],
+                serialize_basket,
+                lambda: basket_values_serializer.basket_to_representation(basket),
+            )
+            self.compare(
+                "orders with lines", options['orders'] * (options['lines'] + 1), options['repeat'],
+                lambda: OrderSerializer(
+                    OrderSerializer.setup_eager_loading(orders), many=True, include_lines=True).data,
+                lambda: order_values_serializer.orders_to_representation(order_values_serializer.values(orders)),
+            )
+        finally:
+            User.objects.filter(pk=user.pk).delete()
+            Product.objects.filter(pk__in=[product.pk for product in products]).delete()
+
+    def compare(self, name, rows, repeat, model_serializer, values_serializer):
+        model_time, values_time = self.time(model_serializer, repeat), self.time(values_serializer, repeat)
+        self.stdout.write(
+            f"{name}: {model_time / rows * 1e6:.1f}us/row with the model serializer, "
+            f"{values_time / rows * 1e6:.1f}us/row with the values serializer, "
+            f"{model_time / values_time:.1f}x faster")
+
+    def time(self, serialize, repeat):
+        serialize()
+        start = perf_counter()
+        for _ in range(repeat):
+            serialize()
+        return (perf_counter() - start) / repeat
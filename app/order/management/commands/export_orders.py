@@ -0,0 +1,54 @@
+import argparse
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
+
+from app.order import export
+from app.order.models import Order
+
+
+def since(value):
+    """
+    An ISO 8601 time or date, a date meaning its midnight, in the current
+    time zone unless the value has one.
+    """
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            moment = datetime.combine(day, time()) if day is not None else None
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise argparse.ArgumentTypeError(f"{value!r} is not an ISO 8601 date or time")
+    return make_aware(moment) if is_naive(moment) else moment
+
+
+class Command(BaseCommand):
+    help = "Stream orders as NDJSON or CSV, with constant memory whatever the number of orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=export.FORMATS, default=export.NDJSON)
+        parser.add_argument('--lines', action='store_true', help="Include the order lines.")
+        parser.add_argument('--output', help="File to write to, defaults to stdout.")
+        parser.add_argument('--status', choices=[status for status, __ in Order.STATUS_CHOICES])
+        parser.add_argument(
+            '--since', type=since, help="Only orders placed at or after this ISO 8601 time or date.")
+        parser.add_argument('--chunk-size', type=int, default=export.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        orders = Order.objects.all()
+        if options['status']:
+            orders = orders.filter(status=options['status'])
+        if options['since']:
+            orders = orders.filter(created__gte=options['since'])
+
+        chunks = export.iter_export(orders, options['format'], options['lines'], options['chunk_size'])
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['output'], 'w', newline='') as output:
+            output.writelines(chunks)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from app.order.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Delete the order Idempotency-Keys older than IDEMPOTENCY_KEY_TTL."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired idempotency key(s)."))
@@ -0,0 +1,61 @@
+import random
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from app.catalogue.models import Product
+from app.order.stress import Shopper, check_invariants, run_stress
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Add products to and check out the same baskets from many concurrent workers through the API, then check "
+        "that no basket was ordered twice, that order totals match their lines and that no quantity was lost. "
+        "A throwaway set of users and products is created and deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help="Number of users, each with their own baskets.")
+        parser.add_argument('--products', type=int, default=20, help="Number of products.")
+        parser.add_argument('--adds', type=int, default=50, help="Products added per user.")
+        parser.add_argument('--checkouts', type=int, default=5, help="Checkouts attempted per user.")
+        parser.add_argument('--workers', type=int, default=16, help="Number of concurrent workers.")
+
+    def handle(self, *args, **options):
+        prefix = f'checkout-stress-{uuid.uuid4().hex[:8]}'
+        # The users are created one by one so that they get their API token.
+        shoppers = [Shopper(User.objects.create(username=f'{prefix}-{i}')) for i in range(options['users'])]
+        products = Product.objects.bulk_create(
+            Product(title=f'{prefix}-{i}', slug=f'{prefix}-{i}', price=random.randint(1, 1000))
+            for i in range(options['products']))
+        # The test client sends requests to the `testserver` host.
+        setup_test_environment()
+        try:
+            report = run_stress(shoppers, products, options['adds'], options['checkouts'], options['workers'])
+            violations = check_invariants(shoppers)
+        finally:
+            teardown_test_environment()
+            User.objects.filter(username__startswith=prefix).delete()
+            Product.objects.filter(pk__in=[product.pk for product in products]).delete()
+
+        self.stdout.write(
+            f"{report['requests']} requests with {options['workers']} workers in {report['elapsed']:.2f}s, "
+            f"{report['throughput']:.1f} requests/s")
+        for (operation, status_code), count in sorted(report['statuses'].items()):
+            self.stdout.write(f"{operation} {status_code}: {count}")
+        for operation, cuts in sorted(report['latency'].items()):
+            self.stdout.write(
+                f"{operation} latency p50 {cuts['p50'] * 1000:.1f}ms, p95 {cuts['p95'] * 1000:.1f}ms, "
+                f"p99 {cuts['p99'] * 1000:.1f}ms")
+        locks = report['locks']
+        self.stdout.write(
+            f"lock waits in {locks['waiting_share']:.0%} of {locks['samples']} samples, up to "
+            f"{locks['max_waiters']} sessions at once, about {locks['wait_time']:.2f}s in total")
+
+        if violations:
+            raise CommandError("Broken invariants:\n" + "\n".join(violations))
+        self.stdout.write(self.style.SUCCESS("No double orders, wrong totals or lost quantities."))
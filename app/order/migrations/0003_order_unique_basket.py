@@ -0,0 +1,26 @@
+# Generated by Django 3.0.8 on 2026-10-18 12:32
+
+from django.db import migrations, models
+
+# Only the first order placed with a basket keeps the link to it.
+UNLINK_DUPLICATE_ORDERS = """
+UPDATE order_order
+SET basket_id = NULL
+WHERE basket_id IS NOT NULL
+  AND id NOT IN (SELECT min(id) FROM order_order WHERE basket_id IS NOT NULL GROUP BY basket_id)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0002_auto_20200802_1353'),
+    ]
+
+    operations = [
+        migrations.RunSQL(UNLINK_DUPLICATE_ORDERS, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='order',
+            constraint=models.UniqueConstraint(fields=('basket',), name='order_order_unique_basket'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.0.8 on 2026-10-18 12:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Copy the basket lines of the orders placed so far.
+BACKFILL_ORDER_LINES = """
+INSERT INTO order_orderline (order_id, product_id, title, quantity, currency, price)
+SELECT order_order.id, cart_line.product_id, catalogue_product.title,
+       cart_line.quantity, cart_line.currency, cart_line.price
+FROM order_order
+JOIN cart_line ON cart_line.basket_id = order_order.basket_id
+JOIN catalogue_product ON catalogue_product.id = cart_line.product_id
+ORDER BY order_order.id, cart_line.created, cart_line.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0005_product_search_vector'),
+        ('order', '0004_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderLine',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(blank=True, max_length=255, verbose_name='Product title')),
+                ('quantity', models.PositiveIntegerField(default=1, verbose_name='Quantity')),
+                ('currency', models.CharField(default='INR', max_length=12, verbose_name='Currency')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=12, null=True, verbose_name='Price incl. Tax')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='order.Order', verbose_name='Order')),
+                ('product', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='order_lines', to='catalogue.Product', verbose_name='Product')),
+            ],
+            options={
+                'ordering': ['pk'],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_ORDER_LINES, migrations.RunSQL.noop),
+    ]
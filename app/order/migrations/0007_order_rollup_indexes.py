@@ -0,0 +1,21 @@
+# Generated by Django 3.0.8 on 2026-10-18 12:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0006_order_history_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['modified'], name='order_order_modified'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['created'], name='order_order_created'),
+        ),
+    ]
@@ -1,9 +1,12 @@
 from django.conf import settings
+from django.contrib.postgres.fields import JSONField
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from model_utils.models import TimeStampedModel
 
 from app.cart.models import Basket
+from app.catalogue.models import Product
 
 
 class Order(TimeStampedModel):
@@ -40,3 +43,79 @@ class Order(TimeStampedModel):
         blank=True,
         choices=STATUS_CHOICES
     )
+
+    class Meta:
+        constraints = [
+            # A basket can only be ordered once.
+            models.UniqueConstraint(fields=['basket'], name='order_order_unique_basket'),
+        ]
+        indexes = [
+            # Serve the keyset paginated order history of a user, optionally
+            # filtered by status and date range.
+            models.Index(fields=['user', 'created', 'id'], name='order_order_user_created'),
+            models.Index(fields=['user', 'status', 'created', 'id'], name='order_order_user_status'),
+            # Serve the incremental refresh of the sales rollups.
+            models.Index(fields=['modified'], name='order_order_modified'),
+            models.Index(fields=['created'], name='order_order_created'),
+        ]
+
+
+class OrderLine(models.Model):
+    """
+    A line of an order, copied from the basket lines at checkout so orders
+    can be read without the cart tables.
+    """
+    order = models.ForeignKey(
+        Order,
+        related_name='lines',
+        verbose_name=_("Order"),
+        on_delete=models.CASCADE
+    )
+    product = models.ForeignKey(
+        Product,
+        related_name='order_lines',
+        verbose_name=_("Product"),
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL
+    )
+    title = models.CharField(_("Product title"), max_length=255, blank=True)
+    quantity = models.PositiveIntegerField(_('Quantity'), default=1)
+    currency = models.CharField(_("Currency"), max_length=12, default='INR')
+    price = models.DecimalField(_('Price incl. Tax'), decimal_places=2, max_digits=12, null=True)
+
+    class Meta:
+        ordering = ['pk']
+
+    def __str__(self):
+        return _("Order #%(order_id)d, %(title)s, quantity %(quantity)d") % {
+            'order_id': self.order_id,
+            'title': self.title,
+            'quantity': self.quantity}
+
+
+class IdempotencyKey(models.Model):
+    """
+    An `Idempotency-Key` sent with an order creation, the fingerprint of the
+    request body and the response that was returned for it. A response still
+    being computed has no status.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='+',
+        verbose_name=_("User"),
+        on_delete=models.CASCADE
+    )
+    key = models.CharField(_("Key"), max_length=255)
+    fingerprint = models.CharField(_("Request fingerprint"), max_length=64, blank=True, default='')
+    status_code = models.PositiveSmallIntegerField(_("Status code"), null=True)
+    response = JSONField(_("Response"), null=True, encoder=DjangoJSONEncoder)
+    created = models.DateTimeField(_("Created"), auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='order_idempotencykey_unique_key'),
+        ]
+
+    def __str__(self):
+        return self.key
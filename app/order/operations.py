@@ -0,0 +1,141 @@
+from django.db import IntegrityError, connection, transaction
+from django.utils.translation import gettext_lazy as _
+
+from app.cart.models import Basket
+from app.order.models import Order
+
+# Totals of the basket lines, along with the lines whose price or currency
+# no longer match their product or whose product was withdrawn from sale or
+# lost its price, in one pass over the lines joined to their products.
+CHECK_LINES_SQL = """
+SELECT count(*),
+       sum(cart_line.price * cart_line.quantity),
+       coalesce(json_agg(json_build_object(
+           'product', catalogue_product.id,
+           'title', catalogue_product.title,
+           'price', cart_line.price::text,
+           'current_price', catalogue_product.price::text,
+           'currency', cart_line.currency,
+           'current_currency', catalogue_product.currency,
+           'is_public', catalogue_product.is_public
+       ) ORDER BY cart_line.created, cart_line.id) FILTER (
+           WHERE cart_line.price IS DISTINCT FROM catalogue_product.price
+              OR cart_line.currency <> catalogue_product.currency
+              OR NOT catalogue_product.is_public
+              OR catalogue_product.price IS NULL
+       ), '[]')
+FROM cart_line
+JOIN catalogue_product ON catalogue_product.id = cart_line.product_id
+WHERE cart_line.basket_id = %(basket)s
+"""
+
+# Snapshot the basket lines into the order with one set based copy.
+COPY_LINES_SQL = """
+INSERT INTO order_orderline (order_id, product_id, title, quantity, currency, price)
+SELECT %(order)s, cart_line.product_id, catalogue_product.title,
+       cart_line.quantity, cart_line.currency, cart_line.price
+FROM cart_line
+JOIN catalogue_product ON catalogue_product.id = cart_line.product_id
+WHERE cart_line.basket_id = %(basket)s
+ORDER BY cart_line.created, cart_line.id
+"""
+
+# Bring the stale lines of a basket up to date: they take the current price
+# and currency of their product, and the products withdrawn from sale or
+# without a price are removed. The basket totals are recalculated afterwards.
+REFRESH_LINES_SQL = """
+UPDATE cart_line
+SET price = catalogue_product.price, currency = catalogue_product.currency, modified = now()
+FROM catalogue_product
+WHERE catalogue_product.id = cart_line.product_id
+  AND cart_line.basket_id = %(basket)s
+  AND catalogue_product.is_public
+  AND catalogue_product.price IS NOT NULL
+  AND (cart_line.price IS DISTINCT FROM catalogue_product.price
+       OR cart_line.currency <> catalogue_product.currency);
+
+DELETE FROM cart_line
+USING catalogue_product
+WHERE catalogue_product.id = cart_line.product_id
+  AND cart_line.basket_id = %(basket)s
+  AND (NOT catalogue_product.is_public OR catalogue_product.price IS NULL)
+"""
+
+
+class StaleBasketLines(ValueError):
+    """
+    Some basket lines no longer matched their product, `lines` describes them
+    as they were. The basket has been brought up to date since.
+    """
+
+    def __init__(self, lines):
+        super().__init__(_("Some products of the basket changed, please review them"))
+        self.lines = lines
+
+
+def place_order(user, basket_id, total=None):
+    """
+    Check out a basket in a single transaction.
+    The basket row is locked with `SELECT ... FOR UPDATE`, so concurrent
+    checkouts of the same basket run one after the other and only the first
+    one finds it open. The totals and the lines whose product changed
+    come from one aggregate query over the lines joined to their products,
+    and the lines are then copied to `OrderLine` with one `INSERT ... SELECT`.
+    Raises `ValueError` when the basket cannot be ordered. When some lines
+    no longer match their product, they are refreshed to the current prices,
+    the products withdrawn from sale are removed, and `StaleBasketLines`
+    lists them so the customer can review the basket and check out again.
+    """
+    with transaction.atomic():
+        try:
+            basket = Basket.objects.select_for_update().get(pk=basket_id, user=user)
+        except Basket.DoesNotExist:
+            raise ValueError(_("Can not checkout, this basket doesn't exist or doesn't belong to you."))
+
+        # Saved baskets can be edited but not ordered.
+        if basket.status != Basket.OPEN:
+            raise ValueError(_("Only open baskets can be checked out"))
+
+        with connection.cursor() as cursor:
+            cursor.execute(CHECK_LINES_SQL, {'basket': basket.pk})
+            num_lines, basket_total, stale_lines = cursor.fetchone()
+        if not num_lines:
+            raise ValueError(_("Empty baskets cannot be submitted"))
+        if stale_lines:
+            # Committed with the transaction, the error is raised afterwards.
+            refresh_stale_lines(basket)
+        else:
+            order = create_order(user, basket, basket_total, total)
+    if stale_lines:
+        raise StaleBasketLines(stale_lines)
+    return order
+
+
+def create_order(user, basket, basket_total, total=None):
+    """
+    Create the order of a locked basket, copy its lines and submit it.
+    """
+    if total is not None and total != basket_total:
+        raise ValueError(_("Total incorrect %s != %s" % (total, basket_total)))
+
+    try:
+        # The savepoint keeps the transaction usable if the constraint fails.
+        with transaction.atomic():
+            order = Order.objects.create(
+                basket=basket, user=user, currency=basket.currency, total=basket_total)
+    except IntegrityError:
+        raise ValueError(_("There is already an order placed with this basket"))
+    with connection.cursor() as cursor:
+        cursor.execute(COPY_LINES_SQL, {'order': order.pk, 'basket': basket.pk})
+    basket.submit()
+    return order
+
+
+def refresh_stale_lines(basket):
+    """
+    Reprice the stale lines of a locked basket and drop the products
+    withdrawn from sale, then recalculate the basket totals.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(REFRESH_LINES_SQL, {'basket': basket.pk})
+    Basket.objects.filter(pk=basket.pk).recalculate_totals()
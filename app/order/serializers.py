@@ -1,25 +1,86 @@
-from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework import exceptions, serializers
 
-from app.cart.models import Basket
-from app.order.models import Order
+from app.base.serializers import ValuesSerializer
+from app.monitoring.timing import timed
+from app.order.models import Order, OrderLine
+from app.order.operations import StaleBasketLines, place_order
+
+
+class OrderLineSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = OrderLine
+        fields = ("id", "product", "title", "quantity", "currency", "price")
 
 
 class OrderSerializer(serializers.ModelSerializer):
     """
     The order serializer
+    Pass `include_lines=True` to embed the order lines, and prefetch them with
+    `setup_eager_loading` to read them with a single query.
     """
     user = serializers.PrimaryKeyRelatedField(read_only=True)
+    lines = OrderLineSerializer(many=True, read_only=True)
 
     class Meta:
         model = Order
-        fields = ("id", "basket", "user", "currency", "total", "status", "created")
+        fields = ("id", "basket", "user", "currency", "total", "status", "created", "lines")
         read_only_fields = ("basket", "status")
 
+    def __init__(self, *args, include_lines=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not include_lines:
+            self.fields.pop("lines")
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.prefetch_related("lines")
+
+
+class OrderLineValuesSerializer(ValuesSerializer):
+    serializer_class = OrderLineSerializer
+
+
+class OrderValuesSerializer(ValuesSerializer):
+    """
+    Renders `values()` rows of orders like `OrderSerializer`, the lines of
+    all the orders being read with one more query when included.
+    """
+    serializer_class = OrderSerializer
+    line_serializer = OrderLineValuesSerializer()
+
+    def __init__(self, include_lines=False):
+        self.serializer_kwargs = {"include_lines": include_lines}
+        self.include_lines = include_lines
+        super().__init__()
+
+    @timed('serialize')
+    def orders_to_representation(self, rows):
+        if not self.include_lines:
+            return [self.to_representation(row) for row in rows]
+        order_lines = OrderLine.objects.filter(order_id__in=[row["id"] for row in rows])
+        lines = self.line_serializer.group_by(order_lines, "order_id")
+        return [self.to_representation(row, lines=lines.get(row["id"], [])) for row in rows]
+
+
+class StaleLinesNotAcceptable(exceptions.NotAcceptable):
+    """
+    Lists the stale lines of a basket. `APIException` would turn every value
+    into a string, so the detail is kept as is.
+    """
+
+    def __init__(self, error):
+        super().__init__()
+        self.detail = {"detail": str(error), "lines": error.lines}
+
 
 class CheckoutSerializer(serializers.Serializer):
-    basket = serializers.PrimaryKeyRelatedField(queryset=Basket.objects.filter(status=Basket.OPEN))
+    """
+    Validates a checkout request. The basket is locked, checked and ordered
+    in a single transaction by `place_order`.
+    """
+    basket = serializers.IntegerField()
     total = serializers.DecimalField(decimal_places=2, max_digits=12, required=False)
 
     def validate(self, attrs):
@@ -28,56 +89,16 @@ class CheckoutSerializer(serializers.Serializer):
         if request.user.is_anonymous:
             message = _("Anonymous checkout forbidden")
             raise serializers.ValidationError(message)
-
-        basket = attrs.get("basket")
-
-        if request.user != basket.user:
-            message = _("Can not checkout, this basket doesn't belong to you.")
-            raise serializers.ValidationError(message)
-
-        # if basket.num_items <= 0:
-        #     message = _("Cannot checkout with empty basket")
-        #     raise serializers.ValidationError(message)
-
-        posted_total = attrs.get("total")
-        total = basket.total
-        if posted_total is not None:
-            if posted_total != total:
-                message = _("Total incorrect %s != %s" % (posted_total, total))
-                raise serializers.ValidationError(message)
-
-        # update attrs with validated data.
-        attrs["total"] = total
-        attrs["basket"] = basket
         return attrs
 
     def create(self, validated_data):
         try:
-            basket = validated_data.get("basket")
-            request = self.context["request"]
-            user = request.user
-
-            if basket.is_empty:
-                raise ValueError(_("Empty baskets cannot be submitted"))
-            if not basket.can_be_edited:
-                raise ValueError(_("This basket cannot be edited"))
-
-            if Order.objects.filter(basket=basket).exists():
-                raise ValueError(_("There is already an order placed with this basket"))
-
-            with transaction.atomic():
-                # Ok - everything seems to be in order, let's place the order
-                order_data = {
-                    'basket': basket,
-                    'currency': basket.currency,
-                    'total': basket.total
-                }
-                if user and user.is_authenticated:
-                    order_data['user'] = user
-                order = Order(**order_data)
-                order.save()
-                basket.submit()
-
-            return order
+            return place_order(
+                self.context["request"].user,
+                validated_data["basket"],
+                total=validated_data.get("total"),
+            )
+        except StaleBasketLines as e:
+            raise StaleLinesNotAcceptable(e)
         except ValueError as e:
             raise exceptions.NotAcceptable(str(e))
@@ -0,0 +1,210 @@
+"""
+Concurrent cart and checkout stress test.
+
+Workers share the same users: every user's baskets get products added and
+get checked out by several workers at once, through the real URLconf with
+the DRF test client, each worker on its own database connection. A sampler
+polls `pg_stat_activity` for sessions waiting on a lock. `check_invariants`
+then looks for double orders, wrong totals and lost quantities.
+"""
+import queue
+import random
+import statistics
+import threading
+from collections import Counter, defaultdict
+from time import perf_counter, sleep
+
+from django.db import connection
+from django.db.models import Count, DecimalField, F, Sum
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app.cart.models import Basket, Line
+from app.order.models import Order, OrderLine
+
+LOCK_WAITERS_SQL = """
+SELECT count(*) FROM pg_stat_activity
+WHERE datname = current_database() AND wait_event_type = 'Lock'
+"""
+
+
+class LockSampler(threading.Thread):
+    """
+    Counts the sessions of the database waiting on a lock every `interval`
+    seconds.
+    """
+
+    def __init__(self, interval=0.01):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            with connection.cursor() as cursor:
+                while not self.stopped.is_set():
+                    cursor.execute(LOCK_WAITERS_SQL)
+                    self.samples.append(cursor.fetchone()[0])
+                    sleep(self.interval)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def report(self):
+        """
+        The share of samples with a session waiting on a lock, the most
+        sessions seen waiting at once and the estimated total time spent
+        waiting, in seconds.
+        """
+        waiting = [waiters for waiters in self.samples if waiters]
+        return {
+            'samples': len(self.samples),
+            'waiting_share': len(waiting) / len(self.samples) if self.samples else 0,
+            'max_waiters': max(waiting, default=0),
+            'wait_time': sum(waiting) * self.interval,
+        }
+
+
+class Shopper:
+    """
+    A user of the stress test, with the quantities of each product the API
+    accepted to add to their baskets.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.added = Counter()
+        self.lock = threading.Lock()
+
+    def client(self):
+        client = APIClient(raise_request_exception=False)
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+        return client
+
+    def add(self, product, quantity):
+        response = self.client().post(reverse('basket'), {'product': product.pk, 'quantity': quantity})
+        if response.status_code == status.HTTP_200_OK:
+            with self.lock:
+                self.added[str(product.pk)] += quantity
+        return response
+
+    def checkout(self):
+        client = self.client()
+        basket = client.get(reverse('basket')).json()
+        return client.post(
+            reverse('order-list-create'), {'basket': basket['id'], 'total': basket['total']}, format='json')
+
+
+def run_stress(shoppers, products, adds=50, checkouts=3, workers=16):
+    """
+    Sends `adds` random additions and `checkouts` checkout attempts per
+    shopper, shuffled, from `workers` threads. Returns the figures of the
+    run: responses by operation and status, latencies, throughput and lock
+    waits.
+    """
+    tasks = [(shopper, 'add') for shopper in shoppers for _ in range(adds)]
+    tasks += [(shopper, 'checkout') for shopper in shoppers for _ in range(checkouts)]
+    random.shuffle(tasks)
+    pending = queue.Queue()
+    for task in tasks:
+        pending.put(task)
+
+    def work(statuses, latencies):
+        # Each worker fills its own counters, merged once they are all done.
+        try:
+            while True:
+                try:
+                    shopper, operation = pending.get_nowait()
+                except queue.Empty:
+                    return
+                start = perf_counter()
+                if operation == 'add':
+                    response = shopper.add(random.choice(products), random.randint(1, 3))
+                else:
+                    response = shopper.checkout()
+                latencies[operation].append(perf_counter() - start)
+                statuses[operation, response.status_code] += 1
+        finally:
+            connection.close()
+
+    sampler = LockSampler()
+    results = [(Counter(), defaultdict(list)) for _ in range(workers)]
+    threads = [threading.Thread(target=work, args=result) for result in results]
+    sampler.start()
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - start
+    sampler.stop()
+
+    statuses, latencies = Counter(), defaultdict(list)
+    for worker_statuses, worker_latencies in results:
+        statuses.update(worker_statuses)
+        for operation, values in worker_latencies.items():
+            latencies[operation].extend(values)
+
+    return {
+        'requests': len(tasks),
+        'elapsed': elapsed,
+        'throughput': len(tasks) / elapsed,
+        'statuses': dict(statuses),
+        'latency': {operation: percentiles(values) for operation, values in latencies.items()},
+        'locks': sampler.report(),
+    }
+
+
+def percentiles(latencies):
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {'p50': cuts[49], 'p95': cuts[94], 'p99': cuts[98]}
+
+
+def check_invariants(shoppers):
+    """
+    Returns a message for each broken invariant:
+    - a basket has a single order, and every submitted basket has one,
+    - the total of an order is the sum of its lines,
+    - the lines of an order are those of its basket,
+    - the quantities the API accepted are all in the shoppers' baskets.
+    """
+    users = [shopper.user for shopper in shoppers]
+    violations = []
+    orders = Order.objects.filter(user__in=users)
+
+    for row in orders.values('basket').annotate(count=Count('id')).filter(count__gt=1):
+        violations.append(f"Basket {row['basket']} has {row['count']} orders")
+    for basket in Basket.objects.filter(user__in=users, status=Basket.SUBMITTED, order__isnull=True):
+        violations.append(f"Basket {basket.pk} is submitted without an order")
+
+    lines_total = Sum(F('lines__price') * F('lines__quantity'), output_field=DecimalField())
+    for order in orders.annotate(lines_total=lines_total):
+        if order.total != order.lines_total:
+            violations.append(f"Order {order.pk} totals {order.total}, its lines {order.lines_total}")
+
+    basket_lines = defaultdict(Counter)
+    for basket, product, quantity in Line.objects.filter(basket__user__in=users).values_list(
+            'basket', 'product', 'quantity'):
+        basket_lines[basket][product] = quantity
+    order_lines = defaultdict(Counter)
+    for basket, product, quantity in OrderLine.objects.filter(order__user__in=users).values_list(
+            'order__basket', 'product', 'quantity'):
+        order_lines[basket][product] = quantity
+    for basket, lines in order_lines.items():
+        if lines != basket_lines[basket]:
+            violations.append(
+                f"The order of basket {basket} has lines {dict(lines)}, the basket {dict(basket_lines[basket])}")
+
+    for shopper in shoppers:
+        in_baskets = Counter()
+        for basket in Basket.objects.filter(user=shopper.user).values_list('pk', flat=True):
+            in_baskets.update({str(product): quantity for product, quantity in basket_lines[basket].items()})
+        if in_baskets != shopper.added:
+            violations.append(
+                f"{shopper.user} was accepted {dict(shopper.added)} but has {dict(in_baskets)} in their baskets")
+    return violations
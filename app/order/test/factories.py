@@ -0,0 +1,13 @@
+import factory
+
+from app.users.test.factories import UserFactory
+
+
+class OrderFactory(factory.django.DjangoModelFactory):
+
+    class Meta:
+        model = 'order.Order'
+
+    user = factory.SubFactory(UserFactory)
+    currency = 'INR'
+    total = 100
@@ -0,0 +1,85 @@
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import now
+from nose.tools import assert_raises, eq_
+
+from ...catalogue.test.factories import ProductFactory
+from ...users.test.factories import UserFactory
+from ..export import iter_csv, iter_ndjson
+from ..models import Order, OrderLine
+from .factories import OrderFactory
+
+
+class ExportTestCase(TestCase):
+    """
+    Tests the streaming order export.
+    """
+
+    def setUp(self):
+        self.orders = [OrderFactory() for _ in range(3)]
+        product = ProductFactory()
+        for order, quantity in zip(self.orders, (2, 0, 1)):
+            for _ in range(quantity):
+                OrderLine.objects.create(
+                    order=order, product=product, title=product.title, quantity=1, currency='INR', price=50
+                )
+
+    def test_ndjson(self):
+        rows = [json.loads(row) for row in iter_ndjson(Order.objects.all())]
+        eq_([row["id"] for row in rows], sorted(order.pk for order in self.orders))
+        eq_(rows[0]["total"], "100.00")
+        eq_("lines" in rows[0], False)
+
+    def test_ndjson_with_lines(self):
+        rows = [json.loads(row) for row in iter_ndjson(Order.objects.all(), include_lines=True, chunk_size=1)]
+        eq_([len(row["lines"]) for row in rows], [2, 0, 1])
+        eq_(rows[0]["lines"][0]["price"], "50.00")
+
+    def test_csv_with_lines(self):
+        rows = list(csv.DictReader(iter_csv(Order.objects.all(), include_lines=True)))
+        eq_([row["id"] for row in rows], [str(self.orders[0].pk)] * 2 + [str(order.pk) for order in self.orders[1:]])
+        eq_([row["line_quantity"] for row in rows], ["1", "1", "", "1"])
+
+    def test_filtered_queryset(self):
+        rows = [json.loads(row) for row in iter_ndjson(Order.objects.filter(pk=self.orders[2].pk), True)]
+        eq_(len(rows), 1)
+        eq_(len(rows[0]["lines"]), 1)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('export_orders', '--lines', stdout=out)
+        eq_(len(out.getvalue().splitlines()), 3)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'orders.csv')
+            call_command('export_orders', '--format', 'csv', '--output', path)
+            with open(path) as output:
+                eq_(len(list(csv.DictReader(output))), 3)
+
+    def test_command_since(self):
+        Order.objects.filter(pk=self.orders[0].pk).update(created=now().replace(year=2019))
+        for since in ('2020-01-01', '2020-01-01T00:00:00+05:30'):
+            out = StringIO()
+            call_command('export_orders', '--since', since, stdout=out)
+            eq_(len(out.getvalue().splitlines()), 2)
+
+        for since in ('yesterday', '2020-13-01'):
+            with assert_raises(CommandError):
+                call_command('export_orders', '--since', since, stdout=StringIO())
+
+    def test_admin_action(self):
+        self.client.force_login(UserFactory(is_staff=True, is_superuser=True))
+        response = self.client.post(reverse('admin:order_order_changelist'), {
+            'action': 'export_csv_with_lines',
+            '_selected_action': [order.pk for order in self.orders[:2]],
+        })
+        eq_(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(b''.join(response.streaming_content).decode().splitlines()))
+        eq_(len(rows), 3)
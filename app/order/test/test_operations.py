@@ -0,0 +1,133 @@
+import threading
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from nose.tools import eq_
+
+from ...cart.models import Basket
+from ...cart.test.factories import BasketFactory
+from ...catalogue.models import Product
+from ...catalogue.test.factories import ProductFactory
+from ...users.test.factories import UserFactory
+from ..models import Order
+from ..operations import StaleBasketLines, place_order
+
+
+class PlaceOrderTestCase(TestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.basket = BasketFactory(user=self.user)
+        self.basket.add_product(ProductFactory(price=100), 2)
+        self.basket.add_product(ProductFactory(price=Decimal('0.50')), 3)
+
+    def test_place_order(self):
+        order = place_order(self.user, self.basket.pk, total=Decimal('201.50'))
+        eq_(order.total, Decimal('201.50'))
+        eq_(order.currency, 'INR')
+        self.basket.refresh_from_db()
+        eq_(self.basket.status, Basket.SUBMITTED)
+
+    def test_place_order_copies_lines(self):
+        order = place_order(self.user, self.basket.pk)
+        basket_lines = list(self.basket.lines.values_list('product', 'quantity', 'price', 'currency'))
+        order_lines = list(order.lines.values_list('product', 'quantity', 'price', 'currency'))
+        eq_(order_lines, basket_lines)
+        eq_(order.lines.first().title, self.basket.lines.first().product.title)
+
+    def test_place_order_query_count(self):
+        # savepoint, lock basket, check lines, savepoint, insert order,
+        # release savepoint, copy lines, submit basket, release savepoint
+        with self.assertNumQueries(9):
+            place_order(self.user, self.basket.pk)
+
+    def test_place_order_stale_lines(self):
+        first, second = self.basket.lines.order_by('created')
+        Product.objects.filter(pk=first.product_id).update(price=90)
+        Product.objects.filter(pk=second.product_id).update(is_public=False)
+        with self.assertRaises(StaleBasketLines) as context:
+            place_order(self.user, self.basket.pk)
+        eq_([line['product'] for line in context.exception.lines], [str(first.product_id), str(second.product_id)])
+        eq_((context.exception.lines[0]['price'], context.exception.lines[0]['current_price']), ('100.00', '90.00'))
+        eq_(context.exception.lines[1]['is_public'], False)
+        eq_(Order.objects.count(), 0)
+
+        # The basket was brought up to date, it can be checked out again.
+        eq_(list(self.basket.lines.values_list('product', 'price')), [(first.product_id, Decimal('90.00'))])
+        self.basket.refresh_from_db()
+        eq_((self.basket.total, self.basket.num_lines, self.basket.num_items), (Decimal('180.00'), 1, 2))
+        order = place_order(self.user, self.basket.pk, total=Decimal('180.00'))
+        eq_(order.total, Decimal('180.00'))
+
+    def test_place_order_with_price_cleared(self):
+        first, second = self.basket.lines.order_by('created')
+        Product.objects.filter(pk=second.product_id).update(price=None)
+        with self.assertRaises(StaleBasketLines) as context:
+            place_order(self.user, self.basket.pk)
+        eq_([line['product'] for line in context.exception.lines], [str(second.product_id)])
+        eq_(context.exception.lines[0]['current_price'], None)
+
+        # The line without a price left the basket instead of being repriced.
+        eq_(list(self.basket.lines.values_list('product', flat=True)), [first.product_id])
+        order = place_order(self.user, self.basket.pk, total=Decimal('200.00'))
+        eq_(order.total, Decimal('200.00'))
+        eq_(list(order.lines.values_list('price', flat=True)), [Decimal('100.00')])
+
+    def test_place_order_with_all_prices_cleared(self):
+        Product.objects.filter(basket_lines__basket=self.basket).update(price=None)
+        with self.assertRaises(StaleBasketLines):
+            place_order(self.user, self.basket.pk)
+        with self.assertRaisesMessage(ValueError, "Empty baskets cannot be submitted"):
+            place_order(self.user, self.basket.pk)
+        eq_(Order.objects.count(), 0)
+
+    def test_place_saved_basket(self):
+        Basket.objects.filter(pk=self.basket.pk).update(status=Basket.SAVED)
+        with self.assertRaises(ValueError):
+            place_order(self.user, self.basket.pk)
+        eq_(Order.objects.count(), 0)
+        self.basket.refresh_from_db()
+        eq_(self.basket.status, Basket.SAVED)
+
+    def test_place_order_twice(self):
+        place_order(self.user, self.basket.pk)
+        with self.assertRaises(ValueError):
+            place_order(self.user, self.basket.pk)
+        eq_(Order.objects.filter(basket=self.basket).count(), 1)
+
+    def test_place_order_of_other_user(self):
+        with self.assertRaises(ValueError):
+            place_order(UserFactory(), self.basket.pk)
+
+    def test_place_order_with_wrong_total(self):
+        with self.assertRaises(ValueError):
+            place_order(self.user, self.basket.pk, total=Decimal('10.00'))
+        self.basket.refresh_from_db()
+        eq_(self.basket.status, Basket.OPEN)
+
+
+class ConcurrentPlaceOrderTestCase(TransactionTestCase):
+
+    def test_concurrent_checkouts_place_one_order(self):
+        user = UserFactory()
+        basket = BasketFactory(user=user)
+        basket.add_product(ProductFactory(price=100), 1)
+        errors = []
+
+        def checkout():
+            try:
+                place_order(user, basket.pk)
+            except ValueError as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=checkout) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        eq_(Order.objects.filter(basket=basket).count(), 1)
+        eq_(len(errors), 7)
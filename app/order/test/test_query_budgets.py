@@ -0,0 +1,51 @@
+from django.urls import reverse
+from nose.tools import eq_
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ...base.test.query_budget import QueryBudgetMixin
+from ...cart.models import Basket
+from ...catalogue.test.factories import ProductFactory
+from ...users.test.factories import UserFactory
+from ..operations import place_order
+
+
+class OrderQueryBudgetTestCase(QueryBudgetMixin, APITestCase):
+    """
+    Checkout and the order history run a fixed number of queries whatever
+    the number of lines and orders.
+    """
+
+    def setUp(self):
+        self.url = reverse('order-list-create')
+        self.user = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+        # Authenticate outside of the budgets.
+        self.client.get(self.url)
+
+    def fill_basket(self, num_lines):
+        basket = Basket.objects.create(user=self.user)
+        for _ in range(num_lines):
+            basket.add_product(ProductFactory(), 2)
+        return basket
+
+    def grow_orders(self, size):
+        for _ in range(size - self.user.orders.count()):
+            place_order(self.user, self.fill_basket(3).pk)
+
+    def test_checkout(self):
+        def request(basket):
+            response = self.client.post(self.url, {"basket": basket.pk, "total": basket.total})
+            eq_(response.status_code, status.HTTP_201_CREATED)
+        self.assertQueryBudget('order-checkout', self.fill_basket, request)
+
+    def test_list_orders(self):
+        def request(_):
+            eq_(self.client.get(self.url, {"page_size": 100}).status_code, status.HTTP_200_OK)
+        self.assertQueryBudget('order-list', self.grow_orders, request)
+
+    def test_list_orders_with_lines(self):
+        def request(_):
+            response = self.client.get(self.url, {"page_size": 100, "include": "lines"})
+            eq_(response.status_code, status.HTTP_200_OK)
+        self.assertQueryBudget('order-list-lines', self.grow_orders, request)
@@ -0,0 +1,39 @@
+import json
+
+from django.test import TestCase
+from nose.tools import eq_
+from rest_framework.renderers import JSONRenderer
+
+from ...catalogue.test.factories import ProductFactory
+from ..models import Order, OrderLine
+from ..serializers import OrderSerializer, OrderValuesSerializer
+from .factories import OrderFactory
+
+
+def render(data):
+    return json.loads(JSONRenderer().render(data))
+
+
+class OrderValuesSerializerTestCase(TestCase):
+    """
+    Tests that `OrderValuesSerializer` renders orders like `OrderSerializer`.
+    """
+
+    def setUp(self):
+        product = ProductFactory()
+        for num_lines in (0, 1, 3):
+            order = OrderFactory(total='12.30')
+            for quantity in range(num_lines):
+                OrderLine.objects.create(
+                    order=order, product=product, title=product.title, quantity=quantity + 1, currency='INR',
+                    price='4.10')
+        OrderLine.objects.create(order=order, product=None, title='Removed', quantity=1, currency='INR', price=None)
+
+    def test_same_representation(self):
+        orders = Order.objects.order_by('pk')
+        for include_lines in (False, True):
+            values_serializer = OrderValuesSerializer(include_lines=include_lines)
+            eq_(
+                render(values_serializer.orders_to_representation(values_serializer.values(orders))),
+                render(OrderSerializer(orders, many=True, include_lines=include_lines).data),
+            )
@@ -0,0 +1,41 @@
+from django.core.cache import cache
+from django.test import TransactionTestCase
+from nose.tools import eq_, ok_
+
+from ...catalogue.test.factories import ProductFactory
+from ...users.test.factories import UserFactory
+from ..models import Order
+from ..stress import Shopper, check_invariants, run_stress
+
+
+class StressTestCase(TransactionTestCase):
+    """
+    Tests the concurrent cart and checkout stress test.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.shoppers = [Shopper(UserFactory()) for _ in range(3)]
+        self.products = [ProductFactory() for _ in range(4)]
+
+    def test_run_stress(self):
+        report = run_stress(self.shoppers, self.products, adds=10, checkouts=2, workers=4)
+        eq_(report['requests'], 36)
+        eq_(sum(report['statuses'].values()), 36)
+        ok_(all(status_code < 500 for __, status_code in report['statuses']))
+        eq_(set(report['latency']), {'add', 'checkout'})
+        eq_(set(report['locks']), {'samples', 'waiting_share', 'max_waiters', 'wait_time'})
+        eq_(check_invariants(self.shoppers), [])
+
+    def test_check_invariants(self):
+        shopper = self.shoppers[0]
+        shopper.add(self.products[0], 2)
+        eq_(shopper.checkout().status_code, 201)
+        eq_(check_invariants(self.shoppers), [])
+
+        Order.objects.update(total=1)
+        shopper.added[str(self.products[1].pk)] += 1
+        violations = check_invariants(self.shoppers)
+        eq_(len(violations), 2)
+        ok_(violations[0].startswith(f"Order {Order.objects.get().pk} totals 1.00"))
+        ok_(violations[1].startswith(f"{shopper.user} was accepted"))
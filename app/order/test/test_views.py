@@ -1,12 +1,23 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils.timezone import now
 from faker import Faker
-from nose.tools import eq_
+from nose.tools import eq_, ok_
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from ...cart.test.factories import BasketFactory
 from ...catalogue.test.factories import ProductFactory
 from ...users.test.factories import UserFactory
+from ..models import IdempotencyKey, Order
+from ..operations import place_order
+from .factories import OrderFactory
 
 fake = Faker()
 
@@ -75,6 +86,50 @@ class ListCreateOrderTestCase(APITestCase):
         )
         eq_(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
 
+    def test_place_order_stale_lines(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+        self.basket.add_product(self.product)
+        self.product.currency = 'USD'
+        self.product.save()
+        response = self.client.post(self.url, {"basket": self.basket.id})
+        eq_(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        eq_(response.data["lines"][0]["product"], str(self.product.pk))
+        eq_(response.data["lines"][0]["current_currency"], 'USD')
+
+    def test_place_order_stale_lines_types(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+        self.basket.add_product(self.product)
+        self.basket.add_product(ProductFactory(price=10))
+        self.product.is_public = False
+        self.product.save()
+        response = self.client.post(self.url, {"basket": self.basket.id})
+        eq_(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        line = response.json()["lines"][0]
+        eq_(line["is_public"], False)
+        eq_(line["price"], f"{self.product.price:.2f}")
+
+        # The withdrawn product left the basket, which can now be ordered.
+        response = self.client.post(self.url, {"basket": self.basket.id, "total": "10.00"})
+        eq_(response.status_code, status.HTTP_201_CREATED)
+
+    def test_place_order_twice(self):
+        """
+        A basket can only be ordered once.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+        self.basket.add_product(self.product)
+        response = self.client.post(self.url, {"basket": self.basket.id})
+        eq_(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(self.url, {"basket": self.basket.id})
+        eq_(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
+    def test_place_order_with_basket_of_other_user(self):
+        other = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {other.auth_token}')
+        self.basket.add_product(self.product)
+        response = self.client.post(self.url, {"basket": self.basket.id})
+        eq_(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
     def test_list_orders_anonymous(self):
         """
         A user must be logged in to get list of orders.
@@ -87,7 +142,175 @@ class ListCreateOrderTestCase(APITestCase):
         A user can fetch their own orders with the order API.
         """
         self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+        self.basket.add_product(self.product)
+        place_order(self.user, self.basket.pk)
+        OrderFactory()
         response = self.client.get(self.url)
         eq_(response.status_code, status.HTTP_200_OK)
-        for order in response.data:
-            eq_(order.user, self.user)
+        eq_(len(response.data["results"]), 1)
+        for order in response.data["results"]:
+            eq_(str(order["user"]), str(self.user.pk))
+
+
+class IdempotentCreateOrderTestCase(APITestCase):
+    """
+    Tests /order post operation with an Idempotency-Key.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('order-list-create')
+        self.user = UserFactory()
+        self.basket = BasketFactory(user=self.user)
+        self.basket.add_product(ProductFactory())
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+
+    def post(self, key):
+        return self.client.post(self.url, {"basket": self.basket.id}, HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_response(self):
+        first = self.post('key-1')
+        eq_(first.status_code, status.HTTP_201_CREATED)
+
+        with CaptureQueriesContext(connection) as queries:
+            retry = self.post('key-1')
+        eq_(retry.status_code, status.HTTP_201_CREATED)
+        eq_(retry['Idempotent-Replayed'], 'true')
+        eq_(retry.json(), first.json())
+        ok_(not any('order_order' in q['sql'] or 'cart_basket' in q['sql'] for q in queries))
+        eq_(Order.objects.filter(user=self.user).count(), 1)
+
+    def test_retry_replays_response_from_database(self):
+        first = self.post('key-1')
+        cache.clear()
+        retry = self.post('key-1')
+        eq_(retry.status_code, status.HTTP_201_CREATED)
+        eq_(retry.json(), first.json())
+
+    def test_other_key_runs_checkout(self):
+        eq_(self.post('key-1').status_code, status.HTTP_201_CREATED)
+        eq_(self.post('key-2').status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
+    def test_failed_request_releases_key(self):
+        self.basket.add_product(self.basket.lines.get().product, -1)
+        eq_(self.post('key-1').status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        self.basket.add_product(ProductFactory())
+        eq_(self.post('key-1').status_code, status.HTTP_201_CREATED)
+
+    def test_key_in_progress(self):
+        self.post('key-1')
+        IdempotencyKey.objects.update(status_code=None, response=None)
+        cache.clear()
+        eq_(self.post('key-1').status_code, status.HTTP_409_CONFLICT)
+
+    def test_abandoned_key_is_taken_over(self):
+        # A reservation whose request died before storing or releasing it.
+        self.post('key-1')
+        Order.objects.all().delete()
+        self.basket.refresh_from_db()
+        self.basket.status = self.basket.OPEN
+        self.basket.save()
+        cache.clear()
+        IdempotencyKey.objects.update(status_code=None, response=None)
+        eq_(self.post('key-1').status_code, status.HTTP_409_CONFLICT)
+        IdempotencyKey.objects.update(created=now() - timedelta(minutes=5))
+        eq_(self.post('key-1').status_code, status.HTTP_201_CREATED)
+
+    def test_key_reused_with_other_request(self):
+        eq_(self.post('key-1').status_code, status.HTTP_201_CREATED)
+        other = BasketFactory(user=UserFactory())
+        for clear in (False, True):
+            if clear:
+                cache.clear()
+            response = self.client.post(self.url, {"basket": other.id}, HTTP_IDEMPOTENCY_KEY='key-1')
+            eq_(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_expired_keys_are_purged(self):
+        self.post('key-1')
+        IdempotencyKey.objects.update(created=now() - timedelta(days=2))
+        call_command('purge_idempotency_keys', stdout=StringIO())
+        eq_(IdempotencyKey.objects.count(), 0)
+
+
+class OrderLinesTestCase(APITestCase):
+    """
+    Tests `?include=lines` on /order get operations.
+    """
+
+    def setUp(self):
+        self.url = reverse('order-list-create')
+        self.user = UserFactory()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+
+    def place_order(self, num_lines):
+        basket = BasketFactory(user=self.user)
+        for _ in range(num_lines):
+            basket.add_product(ProductFactory(), 2)
+        return place_order(self.user, basket.pk)
+
+    def test_lines_not_included_by_default(self):
+        order = self.place_order(1)
+        response = self.client.get(reverse('order-detail', kwargs={'pk': order.pk}))
+        ok_("lines" not in response.data)
+
+    def test_detail_include_lines(self):
+        order = self.place_order(2)
+        response = self.client.get(reverse('order-detail', kwargs={'pk': order.pk}), {"include": "lines"})
+        eq_(response.status_code, status.HTTP_200_OK)
+        eq_(len(response.data["lines"]), 2)
+        eq_(response.data["lines"][0]["quantity"], 2)
+
+    def test_list_include_lines_query_count(self):
+        self.place_order(1)
+        # Authenticate once so that both requests find the token cached.
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url, {"include": "lines"})
+        for _ in range(3):
+            self.place_order(3)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url, {"include": "lines"})
+        eq_(len(large), len(small))
+        eq_(sum(len(order["lines"]) for order in response.data["results"]), 10)
+
+
+class OrderHistoryTestCase(APITestCase):
+    """
+    Tests pagination and filters of the /order get operation.
+    """
+
+    def setUp(self):
+        self.url = reverse('order-list-create')
+        self.user = UserFactory()
+        self.orders = [OrderFactory(user=self.user) for _ in range(5)]
+        Order.objects.filter(pk=self.orders[0].pk).update(
+            status=Order.CANCELLED, created=now() - timedelta(days=10))
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+
+    def ids(self, response):
+        eq_(response.status_code, status.HTTP_200_OK)
+        return [order["id"] for order in response.data["results"]]
+
+    def test_cursor_pagination(self):
+        seen = []
+        url = self.url + '?page_size=2'
+        while url:
+            response = self.client.get(url)
+            ok_("count" not in response.data)
+            seen += self.ids(response)
+            url = response.data["next"]
+        eq_(seen, [order.pk for order in reversed(self.orders)])
+
+    def test_filter_status(self):
+        response = self.client.get(self.url, {"status": Order.CANCELLED})
+        eq_(self.ids(response), [self.orders[0].pk])
+
+    def test_filter_date_range(self):
+        response = self.client.get(self.url, {"created_before": (now() - timedelta(days=1)).isoformat()})
+        eq_(self.ids(response), [self.orders[0].pk])
+        response = self.client.get(self.url, {"created_after": (now() - timedelta(days=1)).isoformat()})
+        eq_(len(self.ids(response)), 4)
+
+    def test_filter_wrong_status(self):
+        response = self.client.get(self.url, {"status": "Lost"})
+        eq_(response.status_code, status.HTTP_400_BAD_REQUEST)
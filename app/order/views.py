@@ -1,22 +1,64 @@
+from django.utils.translation import gettext_lazy as _
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics, response, status
 from rest_framework.permissions import IsAuthenticated
 
+from app.base.pagination import CreatedCursorPagination
 from app.base.permissions import IsOwner
+from app.order import idempotency
+from app.order.filters import OrderFilter
 from app.order.models import Order
-from app.order.serializers import CheckoutSerializer, OrderSerializer
+from app.order.serializers import (CheckoutSerializer, OrderSerializer,
+                                   OrderValuesSerializer)
 
 
-class OrderDetail(generics.RetrieveAPIView):
+class IncludeLinesMixin:
+    """
+    `?include=lines` embeds the order lines, read with a single prefetch.
+    """
+
+    def include_lines(self):
+        return 'lines' in self.request.query_params.get('include', '').split(',')
+
+
+class OrderDetail(IncludeLinesMixin, generics.RetrieveAPIView):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = (IsOwner,)
 
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.include_lines():
+            qs = self.serializer_class.setup_eager_loading(qs)
+        return qs
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs['include_lines'] = self.include_lines()
+        return super().get_serializer(*args, **kwargs)
+
 
-class OrderListCreate(generics.GenericAPIView):
+class OrderListCreate(IncludeLinesMixin, generics.GenericAPIView):
+    """
+    GET: List your orders, newest first.
+    Paginated with an opaque `cursor` query parameter and filtered with
+    `?status=`, `?created_after=` and `?created_before=` (ISO 8601).
+    POST: Check out a basket.
+    POST(url, basket, total)
+    {
+        "basket": 1,
+        "total": "200.00"
+    }
+    `?include=lines` embeds the order lines in the orders listed.
+    Send an `Idempotency-Key` header to safely retry a checkout: a retry with
+    the same key gets the original 201 response back.
+    """
     order_serializer_class = OrderSerializer
     serializer_class = CheckoutSerializer
     permission_classes = (IsAuthenticated,)
     queryset = Order.objects
+    pagination_class = CreatedCursorPagination
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = OrderFilter
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
@@ -24,12 +66,50 @@ class OrderListCreate(generics.GenericAPIView):
         else:
             return self.serializer_class
 
+    # Compiled once, render the orders listed from `values()` rows.
+    order_values_serializers = {
+        include_lines: OrderValuesSerializer(include_lines=include_lines) for include_lines in (False, True)
+    }
+
     def get(self, request):
-        qs = Order.objects.filter(user=request.user)
-        orders_data = self.order_serializer_class(qs, many=True).data
-        return response.Response(orders_data)
+        values_serializer = self.order_values_serializers[self.include_lines()]
+        qs = self.filter_queryset(Order.objects.filter(user=request.user))
+        page = self.paginate_queryset(values_serializer.values(qs))
+        return self.get_paginated_response(values_serializer.orders_to_representation(page))
 
     def post(self, request):
+        key = request.META.get(idempotency.HEADER)
+        if not key:
+            return self.checkout(request)
+
+        if len(key) > idempotency.MAX_KEY_LENGTH:
+            return response.Response(
+                {"reason": _("Idempotency-Key is too long.")}, status.HTTP_400_BAD_REQUEST)
+        request_fingerprint = idempotency.fingerprint(request.data)
+        try:
+            stored = idempotency.get_or_reserve(request.user, key, request_fingerprint)
+        except idempotency.KeyReused:
+            return response.Response(
+                {"reason": _("This Idempotency-Key was used with a different request.")},
+                status.HTTP_422_UNPROCESSABLE_ENTITY)
+        except idempotency.KeyInUse:
+            return response.Response(
+                {"reason": _("A request with this Idempotency-Key is in progress.")}, status.HTTP_409_CONFLICT)
+        if stored is not None:
+            status_code, data = stored
+            return response.Response(data, status_code, headers={idempotency.REPLAYED_HEADER: 'true'})
+
+        resp = None
+        try:
+            resp = self.checkout(request)
+        finally:
+            if resp is not None and resp.status_code == status.HTTP_201_CREATED:
+                idempotency.store(request.user, key, resp.status_code, resp.data, request_fingerprint)
+            else:
+                idempotency.release(request.user, key)
+        return resp
+
+    def checkout(self, request):
         c_ser = self.serializer_class(data=request.data, context={"request": request})
 
         if c_ser.is_valid():
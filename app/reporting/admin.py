@@ -0,0 +1,27 @@
+from django.contrib import admin
+
+from app.reporting.models import ProductClassDailySales, ProductDailySales
+
+
+class DailySalesAdmin(admin.ModelAdmin):
+    date_hierarchy = 'day'
+    list_filter = ('currency',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ProductDailySales)
+class ProductDailySalesAdmin(DailySalesAdmin):
+    list_display = ('day', 'product', 'currency', 'units', 'revenue', 'orders')
+    list_select_related = ('product',)
+    raw_id_fields = ('product',)
+
+
+@admin.register(ProductClassDailySales)
+class ProductClassDailySalesAdmin(DailySalesAdmin):
+    list_display = ('day', 'product_class', 'currency', 'units', 'revenue', 'orders')
+    list_select_related = ('product_class',)
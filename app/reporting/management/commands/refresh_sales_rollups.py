@@ -0,0 +1,25 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from app.reporting.rollups import refresh_days, refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Refresh the daily sales rollups from the orders modified since the last refresh."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help="Rebuild the rollups of every day.")
+        parser.add_argument(
+            '--day', action='append', type=date.fromisoformat,
+            help="Rebuild the rollups of this day (YYYY-MM-DD) only, e.g. after orders were deleted. Can be repeated.")
+
+    def handle(self, *args, **options):
+        if options['day']:
+            refresh_days(options['day'])
+            days = options['day']
+        else:
+            days = refresh_rollups(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed the sales rollups of {len(days)} days."))
@@ -0,0 +1,72 @@
+# Generated by Django 3.0.8 on 2026-10-18 12:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('catalogue', '0005_product_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Watermark',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True, verbose_name='Name')),
+                ('value', models.DateTimeField(blank=True, null=True, verbose_name='Value')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProductDailySales',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Day')),
+                ('currency', models.CharField(max_length=12, verbose_name='Currency')),
+                ('units', models.PositiveIntegerField(verbose_name='Units sold')),
+                ('revenue', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Revenue')),
+                ('orders', models.PositiveIntegerField(verbose_name='Number of orders')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalogue.Product', verbose_name='Product')),
+            ],
+            options={
+                'verbose_name': 'Product daily sales',
+                'verbose_name_plural': 'Product daily sales',
+                'ordering': ['-day'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductClassDailySales',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Day')),
+                ('currency', models.CharField(max_length=12, verbose_name='Currency')),
+                ('units', models.PositiveIntegerField(verbose_name='Units sold')),
+                ('revenue', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Revenue')),
+                ('orders', models.PositiveIntegerField(verbose_name='Number of orders')),
+                ('product_class', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalogue.ProductClass', verbose_name='Product class')),
+            ],
+            options={
+                'verbose_name': 'Product class daily sales',
+                'verbose_name_plural': 'Product class daily sales',
+                'ordering': ['-day'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='productdailysales',
+            index=models.Index(fields=['product', 'day'], name='reporting_product_daily_day'),
+        ),
+        migrations.AddConstraint(
+            model_name='productdailysales',
+            constraint=models.UniqueConstraint(fields=('day', 'product', 'currency'), name='reporting_product_daily_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='productclassdailysales',
+            index=models.Index(fields=['day'], name='reporting_class_daily_day'),
+        ),
+    ]
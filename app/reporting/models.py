@@ -0,0 +1,76 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from app.catalogue.models import Product, ProductClass
+
+
+class DailySales(models.Model):
+    """
+    Sales of a day, in one currency, aggregated from the order lines.
+    Rows are rebuilt by `app.reporting.rollups.refresh_rollups`, never edited.
+    """
+    day = models.DateField(_("Day"))
+    currency = models.CharField(_("Currency"), max_length=12)
+    units = models.PositiveIntegerField(_("Units sold"))
+    revenue = models.DecimalField(_("Revenue"), decimal_places=2, max_digits=14)
+    orders = models.PositiveIntegerField(_("Number of orders"))
+
+    class Meta:
+        abstract = True
+        ordering = ['-day']
+
+
+class ProductDailySales(DailySales):
+    """
+    Daily sales of a product.
+    """
+    product = models.ForeignKey(
+        Product,
+        related_name='+',
+        verbose_name=_("Product"),
+        on_delete=models.CASCADE
+    )
+
+    class Meta(DailySales.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'product', 'currency'], name='reporting_product_daily_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['product', 'day'], name='reporting_product_daily_day'),
+        ]
+        verbose_name = _("Product daily sales")
+        verbose_name_plural = _("Product daily sales")
+
+
+class ProductClassDailySales(DailySales):
+    """
+    Daily sales of a product class, `product_class` is empty for the
+    products without one.
+    """
+    product_class = models.ForeignKey(
+        ProductClass,
+        related_name='+',
+        verbose_name=_("Product class"),
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE
+    )
+
+    class Meta(DailySales.Meta):
+        indexes = [
+            models.Index(fields=['day'], name='reporting_class_daily_day'),
+        ]
+        verbose_name = _("Product class daily sales")
+        verbose_name_plural = _("Product class daily sales")
+
+
+class Watermark(models.Model):
+    """
+    How far the rollups have been refreshed: orders modified up to `value`
+    are accounted for.
+    """
+    name = models.CharField(_("Name"), max_length=64, unique=True)
+    value = models.DateTimeField(_("Value"), null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.name}: {self.value}'
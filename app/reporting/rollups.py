@@ -0,0 +1,93 @@
+"""
+Incremental refresh of the daily sales rollups.
+
+The days to refresh are those of the orders modified since the watermark,
+which catches new orders, status changes saved through the ORM and
+backfilled orders alike. Each of these days is rebuilt from all its order
+lines, so refreshing a day twice is harmless.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+from app.order.models import Order
+from app.reporting.models import Watermark
+
+WATERMARK = 'sales'
+
+CHANGED_DAYS_SQL = """
+SELECT DISTINCT (created AT TIME ZONE %(tz)s)::date
+FROM order_order
+WHERE (modified > %(since)s OR %(since)s IS NULL) AND modified <= %(until)s
+"""
+
+# Order lines of the given days, cancelled orders left out.
+DAY_LINES = """
+FROM unnest(%(days)s::date[]) AS days (day)
+JOIN order_order ON order_order.created >= days.day::timestamp AT TIME ZONE %(tz)s
+                AND order_order.created < (days.day + 1)::timestamp AT TIME ZONE %(tz)s
+JOIN order_orderline ON order_orderline.order_id = order_order.id
+LEFT JOIN catalogue_product ON catalogue_product.id = order_orderline.product_id
+WHERE order_order.status <> %(cancelled)s
+"""
+
+REFRESH_SQL = f"""
+DELETE FROM reporting_productdailysales WHERE day = ANY(%(days)s::date[]);
+DELETE FROM reporting_productclassdailysales WHERE day = ANY(%(days)s::date[]);
+
+INSERT INTO reporting_productdailysales (day, product_id, currency, units, revenue, orders)
+SELECT days.day, order_orderline.product_id, order_orderline.currency, sum(order_orderline.quantity),
+       coalesce(sum(order_orderline.price * order_orderline.quantity), 0), count(DISTINCT order_order.id)
+{DAY_LINES}
+  AND order_orderline.product_id IS NOT NULL
+GROUP BY days.day, order_orderline.product_id, order_orderline.currency;
+
+INSERT INTO reporting_productclassdailysales (day, product_class_id, currency, units, revenue, orders)
+SELECT days.day, catalogue_product.product_class_id, order_orderline.currency, sum(order_orderline.quantity),
+       coalesce(sum(order_orderline.price * order_orderline.quantity), 0), count(DISTINCT order_order.id)
+{DAY_LINES}
+GROUP BY days.day, catalogue_product.product_class_id, order_orderline.currency;
+"""
+
+
+def refresh_days(days):
+    """
+    Rebuild the rollups of the given days.
+    """
+    if not days:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(REFRESH_SQL, {
+            'days': list(days),
+            'tz': settings.TIME_ZONE,
+            'cancelled': Order.CANCELLED,
+        })
+
+
+def refresh_rollups(full=False):
+    """
+    Refresh the rollups of the days with orders modified since the last
+    refresh, or of every day if `full`, and move the watermark forward.
+    Concurrent refreshes wait for each other on the watermark row.
+    Returns the refreshed days.
+    """
+    until = now() - timedelta(seconds=settings.SALES_ROLLUP_LAG)
+    Watermark.objects.get_or_create(name=WATERMARK)
+    with transaction.atomic():
+        watermark = Watermark.objects.select_for_update().get(name=WATERMARK)
+        since = None if full else watermark.value
+        if since is not None and since >= until:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(CHANGED_DAYS_SQL, {'since': since, 'until': until, 'tz': settings.TIME_ZONE})
+            days = sorted(day for (day,) in cursor.fetchall())
+        if full:
+            # Also clear the days whose orders were all deleted.
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM reporting_productdailysales; DELETE FROM reporting_productclassdailysales")
+        refresh_days(days)
+        watermark.value = until
+        watermark.save(update_fields=['value'])
+    return days
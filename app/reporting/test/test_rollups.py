@@ -0,0 +1,98 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils.timezone import make_aware, now
+from nose.tools import eq_
+
+from ...catalogue.test.factories import ProductFactory
+from ...order.models import Order, OrderLine
+from ...order.test.factories import OrderFactory
+from ..models import ProductClassDailySales, ProductDailySales
+from ..rollups import refresh_rollups
+
+
+@override_settings(SALES_ROLLUP_LAG=0)
+class RollupsTestCase(TestCase):
+    """
+    Tests the daily sales rollups.
+    """
+
+    def setUp(self):
+        self.book = ProductFactory(price=100)
+        self.other_book = ProductFactory(price=10, product_class=self.book.product_class)
+        self.toy = ProductFactory(price=5)
+
+    def order(self, day, *lines, **kwargs):
+        order = OrderFactory(**kwargs)
+        Order.objects.filter(pk=order.pk).update(created=make_aware(datetime.combine(day, datetime.min.time())))
+        for product, quantity in lines:
+            OrderLine.objects.create(
+                order=order, product=product, title=product.title, quantity=quantity, currency='INR',
+                price=product.price)
+        return order
+
+    def sales(self, day):
+        products = {
+            str(sales.product_id): (sales.units, sales.revenue, sales.orders)
+            for sales in ProductDailySales.objects.filter(day=day)
+        }
+        classes = {
+            sales.product_class_id: (sales.units, sales.revenue, sales.orders)
+            for sales in ProductClassDailySales.objects.filter(day=day)
+        }
+        return products, classes
+
+    def test_refresh(self):
+        day = date(2020, 8, 1)
+        self.order(day, (self.book, 2), (self.other_book, 1))
+        self.order(day, (self.book, 1), (self.toy, 4))
+        self.order(day, (self.book, 5), status=Order.CANCELLED)
+        eq_(refresh_rollups(), [day])
+
+        products, classes = self.sales(day)
+        eq_(products[self.book.pk], (3, Decimal('300'), 2))
+        eq_(products[self.other_book.pk], (1, Decimal('10'), 1))
+        eq_(classes[self.book.product_class_id], (4, Decimal('310'), 2))
+        eq_(classes[self.toy.product_class_id], (4, Decimal('20'), 1))
+
+    def test_incremental_refresh(self):
+        old_day, new_day = date(2020, 8, 1), date(2020, 8, 2)
+        self.order(old_day, (self.book, 1))
+        refresh_rollups()
+        eq_(refresh_rollups(), [])
+
+        self.order(new_day, (self.book, 1))
+        # A backfilled order of an already refreshed day.
+        self.order(old_day, (self.book, 2))
+        eq_(refresh_rollups(), [old_day, new_day])
+        eq_(self.sales(old_day)[0][self.book.pk], (3, Decimal('300'), 2))
+
+        # Cancelling an order refreshes its day.
+        order = Order.objects.filter(created__date=new_day).get()
+        order.status = Order.CANCELLED
+        order.save()
+        eq_(refresh_rollups(), [new_day])
+        eq_(self.sales(new_day), ({}, {}))
+
+    def test_lag(self):
+        self.order(date(2020, 8, 1), (self.book, 1))
+        with self.settings(SALES_ROLLUP_LAG=60):
+            eq_(refresh_rollups(), [])
+
+    def test_command(self):
+        day = now().date() - timedelta(days=1)
+        self.order(day, (self.book, 1))
+        out = StringIO()
+        call_command('refresh_sales_rollups', stdout=out)
+        eq_(out.getvalue().strip(), "Refreshed the sales rollups of 1 days.")
+
+        ProductDailySales.objects.all().delete()
+        call_command('refresh_sales_rollups', '--full', stdout=out)
+        eq_(ProductDailySales.objects.get().units, 1)
+
+        OrderLine.objects.all().delete()
+        call_command('refresh_sales_rollups', '--day', day.isoformat(), stdout=out)
+        eq_(ProductDailySales.objects.count(), 0)
@@ -4,12 +4,14 @@ from django.contrib import admin
 from django.urls import include, path, re_path, reverse_lazy
 from django.views.generic.base import RedirectView
 from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 from rest_framework.authtoken import views as auth_views
 from rest_framework.routers import DefaultRouter
 
+from .base.schema import get_schema_view
 from .cart import urls as cart_urls
+from .catalogue import urls as catalogue_urls
+from .monitoring.views import export_metrics
 from .order import urls as order_urls
 from .users.views import UserCreateViewSet, UserViewSet
 
@@ -34,10 +36,12 @@ urlpatterns = [
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('api/v1/', include(router.urls)),
+    path('api/v1/products/', include(catalogue_urls)),
     path('api/v1/cart/', include(cart_urls)),
     path('api/v1/orders/', include(order_urls)),
     path('api-token-auth/', auth_views.obtain_auth_token),
     path('accounts/', include('rest_framework.urls', namespace='rest_framework')),
+    path('metrics', export_metrics, name='metrics'),
 
     # the 'api-root' from django rest-frameworks default router
     # http://www.django-rest-framework.org/api-guide/routers/#defaultrouter
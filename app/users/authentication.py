@@ -0,0 +1,123 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+def token_cache_key(key):
+    """
+    Shared cache key of an authentication token, a hash so that the token
+    itself never appears in the cache.
+    """
+    return f'users:token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def freeze_token(token):
+    """
+    The values cached for a token: its creation time and the fields of its
+    user, all but the password.
+    """
+    fields = tuple(field.attname for field in get_user_model()._meta.concrete_fields if field.attname != 'password')
+    return token.created, fields, tuple(getattr(token.user, field) for field in fields)
+
+
+def thaw_token(key, frozen):
+    """
+    A new token and user built from the cached values, the password is
+    loaded from the database if it is ever needed.
+    """
+    created, fields, values = frozen
+    user = get_user_model().from_db(DEFAULT_DB_ALIAS, fields, values)
+    token = Token.from_db(DEFAULT_DB_ALIAS, ('key', 'user_id', 'created'), (key, user.pk, created))
+    token.user = user
+    return token
+
+
+class TokenCache:
+    """
+    Least recently used cache of authenticated tokens, local to the process
+    and optionally backed by the shared cache. Entries keep the expiry time
+    they were first cached with, wherever they are read from, so a revoked
+    token is never accepted for longer than `ttl` seconds. Only field values
+    are cached and every `get` builds new instances from them, so requests
+    never share a user object.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return settings.TOKEN_CACHE_TTL
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+        if entry is None and settings.TOKEN_CACHE_SHARED:
+            entry = cache.get(token_cache_key(key))
+            if entry is not None:
+                self.store(key, entry)
+        if entry is None:
+            return None
+        expires, frozen = entry
+        if expires <= time.time():
+            self.delete(key, shared=False)
+            return None
+        return thaw_token(key, frozen)
+
+    def set(self, key, token):
+        if self.ttl <= 0:
+            return
+        entry = (time.time() + self.ttl, freeze_token(token))
+        self.store(key, entry)
+        if settings.TOKEN_CACHE_SHARED:
+            cache.set(token_cache_key(key), entry, self.ttl)
+
+    def store(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > settings.TOKEN_CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def delete(self, key, shared=True):
+        with self.lock:
+            self.entries.pop(key, None)
+        if shared and settings.TOKEN_CACHE_SHARED:
+            cache.delete(token_cache_key(key))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that remembers the token and its user for
+    `TOKEN_CACHE_TTL` seconds instead of querying them on every request.
+    Tokens are evicted when they are deleted and when their user is saved,
+    e.g. deactivated or given a new password (see `app.users.models`).
+    """
+
+    def authenticate_credentials(self, key):
+        token = token_cache.get(key)
+        if token is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, token)
+        elif not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        return token.user, token
@@ -3,10 +3,12 @@ import uuid
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from rest_framework.authtoken.models import Token
 
+from app.users.authentication import token_cache
+
 
 class User(AbstractUser):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -19,3 +21,16 @@ class User(AbstractUser):
 def create_auth_token(sender, instance=None, created=False, **kwargs):
     if created:
         Token.objects.create(user=instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def evict_user_tokens(sender, instance=None, created=False, **kwargs):
+    # The cached user could be inactive or have had its password changed.
+    if not created:
+        for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+            token_cache.delete(key)
+
+
+@receiver(post_delete, sender=Token)
+def evict_token(sender, instance=None, **kwargs):
+    token_cache.delete(instance.key)
@@ -0,0 +1,88 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from nose.tools import eq_, ok_
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..authentication import token_cache, token_cache_key
+from .factories import UserFactory
+
+
+class CachedTokenAuthenticationTestCase(APITestCase):
+    """
+    Tests the cached token authentication.
+    """
+
+    def setUp(self):
+        token_cache.clear()
+        cache.clear()
+        self.user = UserFactory()
+        self.url = reverse('user-detail', kwargs={'pk': self.user.pk})
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.user.auth_token}')
+
+    def get(self):
+        return self.client.get(self.url)
+
+    def test_token_is_cached(self):
+        eq_(self.get().status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(1):
+            eq_(self.get().status_code, status.HTTP_200_OK)
+
+    def test_deleted_token_is_evicted(self):
+        self.get()
+        Token.objects.filter(user=self.user).delete()
+        eq_(self.get().status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_deactivated_user_is_evicted(self):
+        self.get()
+        self.user.is_active = False
+        self.user.save()
+        eq_(self.get().status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_ttl(self):
+        self.get()
+        with mock.patch('app.users.authentication.time.time', return_value=2 ** 40):
+            with self.assertNumQueries(2):
+                self.get()
+
+    def test_disabled(self):
+        with self.settings(TOKEN_CACHE_TTL=0):
+            self.get()
+            with self.assertNumQueries(2):
+                self.get()
+
+    def test_shared_cache(self):
+        with self.settings(TOKEN_CACHE_SHARED=True):
+            self.get()
+            ok_(cache.get(token_cache_key(self.user.auth_token.key)))
+            token_cache.clear()
+            with self.assertNumQueries(1):
+                eq_(self.get().status_code, status.HTTP_200_OK)
+
+            key = self.user.auth_token.key
+            self.user.auth_token.delete()
+            eq_(cache.get(token_cache_key(key)), None)
+
+    def test_shared_cache_entry(self):
+        key = self.user.auth_token.key
+        with self.settings(TOKEN_CACHE_SHARED=True):
+            self.get()
+        ok_(key not in token_cache_key(key))
+        __, (__, fields, values) = cache.get(token_cache_key(key))
+        ok_('password' not in fields)
+        ok_(self.user.password not in values)
+
+    def test_requests_do_not_share_users(self):
+        key = self.user.auth_token.key
+        self.get()
+        first, second = token_cache.get(key), token_cache.get(key)
+        ok_(first is not second and first.user is not second.user)
+        first.user.first_name = 'changed'
+        eq_(second.user.first_name, self.user.first_name)
+        eq_(str(second.user.pk), str(self.user.pk))
+        # The password is not cached but loaded on demand.
+        with self.assertNumQueries(1):
+            eq_(second.user.password, self.user.password)
@@ -0,0 +1,17 @@
+# Loaded by gunicorn from the working directory.
+import os
+import shutil
+
+
+def on_starting(server):
+    # Start with no samples left by the workers of a previous run.
+    path = os.environ.get('prometheus_multiproc_dir')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+
+def child_exit(server, worker):
+    if os.environ.get('prometheus_multiproc_dir'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)